@@ -0,0 +1,116 @@
+"""Benchmark mode LSB: throughput embed dan extract untuk gambar PNG dan audio WAV.
+
+Media dibuat acak dengan ukuran tertentu lalu diisi dokumen sebesar `--fill`
+persen kapasitasnya. MB/s dihitung dari ukuran dokumen; kolom `bit MB/s`
+hanya mengukur pengemasan bit numpy (tanpa dekode/enkode media dan AES).
+
+Contoh:
+    python benchmarks/bench_lsb.py
+    python benchmarks/bench_lsb.py --megapixels 12 24 --seconds 300 --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lsb  # noqa: E402
+import stego  # noqa: E402
+
+MB = 1024 * 1024
+PASSPHRASE = "benchmark"
+
+
+def _make_png(path, megapixels):
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(megapixels * 1e6 / width)
+    # Gradien + derau: lebih mirip foto daripada derau murni
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+    noise = np.random.randint(0, 56, (height, width, 3), dtype=np.uint8)
+    Image.fromarray((gradient + noise).astype(np.uint8), 'RGB').save(path, compress_level=1)
+
+
+def _make_wav(path, seconds, rate=44100):
+    samples = np.random.randint(-8000, 8000, int(seconds * rate) * 2, dtype=np.int16)
+    with wave.open(path, 'wb') as writer:
+        writer.setnchannels(2)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(samples.astype('<i2').tobytes())
+
+
+def _best(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _bits_rate(size, repeat):
+    """MB/s pengemasan + penguraian bit saja, pada array berukuran 8x dokumen."""
+    payload = os.urandom(size)
+    cover = np.random.randint(0, 256, size * 8, dtype=np.uint8)
+    tracker = stego._Progress(None, None, 0)
+
+    def roundtrip():
+        lsb._write_bits(cover, payload, tracker)
+        assert lsb._read_bytes(cover, 0, size) == payload
+
+    return size / MB / _best(roundtrip, repeat)
+
+
+def run_case(label, carrier, tmp, fill, repeat):
+    capacity = lsb.capacity(carrier)
+    # Dokumen acak (tidak terkompresi) yang mengisi `fill` persen kapasitas
+    overhead = stego.payload_size(b'', "bench.bin")
+    size = max(1, int(capacity * fill / 100) - overhead)
+    document = os.path.join(tmp, "bench.bin")
+    with open(document, 'wb') as f:
+        f.write(os.urandom(size))
+    output = os.path.join(tmp, "bench_stego" + os.path.splitext(carrier)[1])
+
+    embed = _best(lambda: lsb.embed_to(document, carrier, PASSPHRASE, output), repeat)
+    extract = _best(lambda: stego.extract(output, PASSPHRASE), repeat)
+    name, data = stego.extract(output, PASSPHRASE)
+    if len(data) != size:
+        raise RuntimeError("Hasil ekstraksi tidak sama dengan dokumen.")
+    print(f"{label:<14} {os.path.getsize(carrier) / MB:>8.1f} {size / MB:>8.2f} "
+          f"{size / MB / embed:>10.1f} {size / MB / extract:>10.1f} "
+          f"{_bits_rate(size, repeat):>10.1f}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--megapixels', nargs='+', type=float, default=[2, 12],
+                        help="ukuran gambar PNG dalam megapiksel")
+    parser.add_argument('--seconds', nargs='+', type=float, default=[60, 300],
+                        help="durasi audio WAV 16-bit stereo 44.1 kHz")
+    parser.add_argument('--fill', type=float, default=90,
+                        help="persen kapasitas media yang diisi dokumen")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"Nilai terbaik dari {args.repeat}x; MB/s dihitung dari ukuran dokumen")
+    print(f"{'media':<14} {'media MB':>8} {'dok MB':>8} {'embed MB/s':>10} "
+          f"{'extract':>10} {'bit MB/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for megapixels in args.megapixels:
+            carrier = os.path.join(tmp, "carrier.png")
+            _make_png(carrier, megapixels)
+            run_case(f"png {megapixels:g} MP", carrier, tmp, args.fill, args.repeat)
+        for seconds in args.seconds:
+            carrier = os.path.join(tmp, "carrier.wav")
+            _make_wav(carrier, seconds)
+            run_case(f"wav {seconds:g} s", carrier, tmp, args.fill, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
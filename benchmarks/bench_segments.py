@@ -0,0 +1,66 @@
+"""Benchmark enkripsi/dekripsi bersegmen untuk berbagai ukuran segmen dan worker.
+
+Contoh:
+    python benchmarks/bench_segments.py --size 1024 --segments 256K 1M 4M --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import stego  # noqa: E402
+
+
+def parse_size(text):
+    """Ukuran seperti 512K, 4M, atau 1G menjadi jumlah byte."""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = text.upper()
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def run(size_mb, segments, workers, repeat):
+    payload = os.urandom(size_mb * 1024 * 1024)
+    # KDF dijalankan sekali agar yang terukur hanya cipher-nya
+    key = stego.derive_key("benchmark", stego.PBKDF2_PARAMS)
+
+    print(f"Payload {size_mb} MB, CPU {os.cpu_count()}, ulang {repeat}x (nilai terbaik)")
+    print(f"{'segmen':>8} {'worker':>6} {'embed MB/s':>11} {'extract MB/s':>13}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_stego.bin")
+        for segment in segments:
+            for count in workers:
+                embed_best = extract_best = float('inf')
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    stego.embed_to(payload, b'', key, path, filename="bench.bin",
+                                   chunk_size=segment, workers=count)
+                    embed_best = min(embed_best, time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    stego.extract(path, "benchmark", workers=count)
+                    extract_best = min(extract_best, time.perf_counter() - start)
+
+                print(f"{segment // 1024:>7}K {count:>6} {size_mb / embed_best:>11.1f} "
+                      f"{size_mb / extract_best:>13.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=256, help="ukuran payload dalam MB")
+    parser.add_argument('--segments', nargs='+', type=parse_size,
+                        default=[parse_size(s) for s in ('64K', '256K', '1M', '4M')])
+    parser.add_argument('--workers', nargs='+', type=int,
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    run(args.size, args.segments, args.workers, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark transfer multi-stream: throughput untuk berbagai jumlah koneksi.
+
+Loopback (receiver dijalankan di proses yang sama):
+    python benchmarks/bench_streams.py --size 256 --streams 1 2 4 8
+
+LAN (jalankan receiver di perangkat tujuan lebih dulu):
+    python benchmarks/bench_streams.py --serve
+    python benchmarks/bench_streams.py --host 192.168.1.20 --size 512
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transfer  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def serve(port, max_connections):
+    """Receiver untuk benchmark LAN; file yang diterima langsung dihapus."""
+    def discard(item):
+        service.take()
+        os.remove(item.path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = transfer.ReceiverService(port=port, temp_dir=tmp, max_connections=max_connections,
+                                           on_received=discard)
+        service.start()
+        print(f"Receiver siap di port {service.port} (Ctrl+C untuk berhenti)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.stop()
+
+
+def run(size_mb, streams, repeat, host, port):
+    service = None
+    tmp = tempfile.TemporaryDirectory()
+    try:
+        if host is None:
+            service = transfer.ReceiverService("127.0.0.1", 0, temp_dir=tmp.name,
+                                               max_connections=max(streams))
+            service.start()
+            host, port = "127.0.0.1", service.port
+
+        path = os.path.join(tmp.name, "bench_streams.bin")
+        with open(path, 'wb') as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(MB))
+
+        print(f"File {size_mb} MB ke {host}:{port}, ulang {repeat}x (nilai terbaik)")
+        print(f"{'stream':>6} {'MB/s':>9} {'detik':>8}")
+        baseline = None
+        for count in streams:
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                if not transfer.send_file(path, host, port, streams=count):
+                    raise RuntimeError("Receiver tidak mengonfirmasi file.")
+                best = min(best, time.perf_counter() - start)
+                if service:
+                    os.remove(service.take().path)
+            throughput = size_mb / best
+            baseline = baseline or throughput
+            print(f"{count:>6} {throughput:>9.1f} {best:>8.3f}  ({throughput / baseline:.2f}x)")
+    finally:
+        if service:
+            service.stop()
+        tmp.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=256, help="ukuran file dalam MB")
+    parser.add_argument('--streams', nargs='+', type=int, default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--host', help="IP receiver untuk uji LAN (default: loopback)")
+    parser.add_argument('--port', type=int, default=transfer.PORT)
+    parser.add_argument('--serve', action='store_true', help="jalankan receiver untuk uji LAN")
+    args = parser.parse_args(argv)
+    if args.serve:
+        serve(args.port, max(args.streams))
+    else:
+        run(args.size, args.streams, args.repeat, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
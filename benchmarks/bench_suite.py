@@ -0,0 +1,261 @@
+"""Benchmark suite headless HIDEasy: embed, extract, dan transfer loopback.
+
+Kasus `stream` mengukur embed yang ditulis langsung ke socket loopback
+(tanpa file perantara), pembanding untuk embed lalu transfer.
+
+Setiap kasus dijalankan di proses anak tersendiri (spawn) agar peak RSS yang
+dilaporkan hanya milik kasus tersebut. Hasil disimpan sebagai JSON dan bisa
+dibandingkan dengan hasil rilis sebelumnya.
+
+Contoh:
+    python benchmarks/bench_suite.py --output hasil.json
+    python benchmarks/bench_suite.py --quick --compare baseline.json
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import stego  # noqa: E402
+import transfer  # noqa: E402
+
+MB = 1024 * 1024
+PASSPHRASE = "benchmark"
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / MB if sys.platform == 'darwin' else peak / 1024
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _write_random(path, size):
+    with open(path, 'wb') as f:
+        for start in range(0, size, MB):
+            f.write(os.urandom(min(MB, size - start)))
+
+
+def _case_embed(document, carrier, output, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stego.embed_to(document, carrier, PASSPHRASE, output)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _case_extract(stego_path, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stego.extract(stego_path, PASSPHRASE)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _case_stream(document, carrier, repeat):
+    """Embed langsung ke socket loopback; receiver di thread terpisah."""
+    service = transfer.ReceiverService("127.0.0.1", 0, max_pending=repeat)
+    service.start()
+    latencies = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if not transfer.send_stream(
+                    lambda out: stego.embed_to(document, carrier, PASSPHRASE, out),
+                    "bench_stego.png", "127.0.0.1", service.port):
+                raise RuntimeError("Receiver tidak mengonfirmasi file.")
+            latencies.append(time.perf_counter() - start)
+            os.remove(service.take().path)
+    finally:
+        service.stop()
+    return latencies
+
+
+def _case_transfer(path, repeat):
+    """Mengirim file lewat loopback ke receiver di thread terpisah."""
+    server_socket = transfer.open_server("127.0.0.1", 0)
+    port = server_socket.getsockname()[1]
+
+    def serve():
+        for _ in range(repeat):
+            _, temp_path = transfer.receive_file(server_socket)
+            os.remove(temp_path)
+
+    server = threading.Thread(target=serve, daemon=True)
+    server.start()
+    latencies = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if not transfer.send_file(path, "127.0.0.1", port):
+                raise RuntimeError("Receiver tidak mengonfirmasi file.")
+            latencies.append(time.perf_counter() - start)
+        server.join()
+    finally:
+        server_socket.close()
+    return latencies
+
+
+def _run_case(kind, args, repeat):
+    """Dijalankan di proses anak; stdout dibungkam agar print protokol tidak mengganggu."""
+    sys.stdout = open(os.devnull, 'w')
+    baseline = _peak_rss_mb()
+    case = {'embed': _case_embed, 'extract': _case_extract, 'stream': _case_stream,
+            'transfer': _case_transfer}[kind]
+    latencies = case(*args, repeat)
+    return latencies, baseline, _peak_rss_mb()
+
+
+def _measure(kind, args, repeat, payload_bytes):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        latencies, baseline, peak = pool.submit(_run_case, kind, args, repeat).result()
+    return {
+        'throughput_mbps': payload_bytes * len(latencies) / MB / sum(latencies),
+        'latency_ms': {name: _percentile(latencies, pct) * 1000
+                       for name, pct in (('p50', 50), ('p90', 90), ('p99', 99))},
+        'rss_baseline_mb': baseline,
+        'peak_rss_mb': peak,
+    }
+
+
+def run(payloads, carriers, transfers, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for payload_mb in payloads:
+            document = os.path.join(tmp, f"doc_{payload_mb}.bin")
+            _write_random(document, int(payload_mb * MB))
+            for carrier_mb in carriers:
+                carrier = os.path.join(tmp, f"carrier_{carrier_mb}.png")
+                if not os.path.exists(carrier):
+                    _write_random(carrier, int(carrier_mb * MB))
+                output = os.path.join(tmp, "stego.png")
+                params = {'payload_mb': payload_mb, 'carrier_mb': carrier_mb}
+
+                result = _measure('embed', (document, carrier, output), repeat,
+                                  payload_mb * MB)
+                results.append(dict(name='embed', **params, **result))
+                _report(results[-1])
+
+                result = _measure('extract', (output,), repeat, payload_mb * MB)
+                results.append(dict(name='extract', **params, **result))
+                _report(results[-1])
+
+                result = _measure('stream', (document, carrier), repeat, payload_mb * MB)
+                results.append(dict(name='stream', **params, **result))
+                _report(results[-1])
+            os.remove(document)
+
+        for size_mb in transfers:
+            path = os.path.join(tmp, f"transfer_{size_mb}.png")
+            _write_random(path, int(size_mb * MB))
+            result = _measure('transfer', (path,), repeat, size_mb * MB)
+            results.append(dict(name='transfer', payload_mb=size_mb, carrier_mb=None, **result))
+            _report(results[-1])
+    return results
+
+
+def _report(result):
+    latency = result['latency_ms']
+    carrier = f"{result['carrier_mb']:>5} MB" if result['carrier_mb'] is not None else f"{'-':>8}"
+    peak = result['peak_rss_mb']
+    print(f"{result['name']:<9} payload {result['payload_mb']:>6} MB carrier {carrier} "
+          f"{result['throughput_mbps']:>9.1f} MB/s  p50 {latency['p50']:>8.1f} ms  "
+          f"p99 {latency['p99']:>8.1f} ms  peak RSS "
+          f"{'-' if peak is None else f'{peak:.1f} MB'}", flush=True)
+
+
+def _key(result):
+    return result['name'], result['payload_mb'], result['carrier_mb']
+
+
+def compare(results, baseline_path, tolerance):
+    """Membandingkan dengan hasil sebelumnya; mengembalikan daftar regresi."""
+    with open(baseline_path) as f:
+        baseline = {_key(r): r for r in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        old = baseline.get(_key(result))
+        if not old:
+            continue
+        limit = 1 - tolerance / 100
+        if result['throughput_mbps'] < old['throughput_mbps'] * limit:
+            regressions.append(f"{_key(result)} throughput {old['throughput_mbps']:.1f} -> "
+                               f"{result['throughput_mbps']:.1f} MB/s")
+        if result['peak_rss_mb'] and old.get('peak_rss_mb') and \
+                result['peak_rss_mb'] > old['peak_rss_mb'] * (1 + tolerance / 100):
+            regressions.append(f"{_key(result)} peak RSS {old['peak_rss_mb']:.1f} -> "
+                               f"{result['peak_rss_mb']:.1f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite HIDEasy")
+    parser.add_argument('--payloads', nargs='+', type=float, default=[1, 16, 64],
+                        help="ukuran dokumen dalam MB")
+    parser.add_argument('--carriers', nargs='+', type=float, default=[0.5, 8],
+                        help="ukuran media dalam MB")
+    parser.add_argument('--transfers', nargs='+', type=float, default=[1, 16],
+                        help="ukuran file transfer loopback dalam MB")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true', help="matriks kecil untuk cek cepat")
+    parser.add_argument('--output', '-o', help="simpan hasil ke file JSON")
+    parser.add_argument('--compare', help="JSON hasil sebelumnya sebagai pembanding")
+    parser.add_argument('--tolerance', type=float, default=10,
+                        help="batas penurunan dalam persen sebelum dianggap regresi")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.payloads, args.carriers, args.transfers, args.repeat = [1, 8], [0.5], [1], 3
+
+    results = run(args.payloads, args.carriers, args.transfers, args.repeat)
+
+    if args.output:
+        meta = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'hostname': socket.gethostname(),
+            'repeat': args.repeat,
+        }
+        with open(args.output, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+        print(f"Hasil disimpan di {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESI: {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""FileSystem FileChooser HIDEasy yang memakai cache pemindaian filescan.
+
+Dipisah dari main.py karena mengimpor kivy.uix.filechooser; main.py baru
+memuat modul ini saat pemilih file pertama kali dibuka.
+"""
+from kivy.clock import Clock
+from kivy.uix.filechooser import FileSystemAbstract
+import os
+
+import filescan
+
+
+PAGE_SIZE = 200  # entri yang dibuat per halaman di FileChooser
+
+directory_cache = filescan.DirectoryCache()
+
+
+class CachedFileSystem(FileSystemAbstract):
+    """FileSystem FileChooser yang membaca isi folder dari directory_cache.
+
+    Folder yang belum ada di cache (atau mtime-nya berubah) ditampilkan
+    kosong dulu dan dipindai di thread latar; `on_scanned(path, error)`
+    dipanggil lewat Clock setelah selesai. Hanya `limit` entri pertama
+    yang dikembalikan agar widget tidak dibuat untuk ribuan file sekaligus.
+    """
+
+    def __init__(self, extensions=None, on_scanned=None):
+        self.extensions = extensions
+        self.on_scanned = on_scanned
+        self.limit = PAGE_SIZE
+        self.total = 0
+        self.scanning = False
+        self._path = None
+        self._kinds = {}  # path -> is_dir untuk entri yang sedang tampil
+
+    def listdir(self, fn):
+        path = os.path.normpath(fn)
+        if path != self._path:
+            self._path = path
+            self.limit = PAGE_SIZE
+        entries = directory_cache.get(path, self.extensions)
+        if entries is None:
+            self.scanning = True
+            self.total = 0
+            self._kinds = {}
+            directory_cache.scan(path, self.extensions, lambda entries, error: Clock.schedule_once(
+                lambda dt: self.on_scanned and self.on_scanned(path, error)))
+            return []
+        self.scanning = False
+        self.total = len(entries)
+        page = entries[:self.limit]
+        self._kinds = {os.path.normpath(entry.path): entry.is_dir for entry in page}
+        return [entry.name for entry in page]
+
+    def getsize(self, fn):
+        return os.path.getsize(fn)
+
+    def is_hidden(self, fn):
+        return os.path.basename(fn).startswith('.')
+
+    def is_dir(self, fn):
+        is_dir = self._kinds.get(os.path.normpath(fn))
+        return os.path.isdir(fn) if is_dir is None else is_dir
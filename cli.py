@@ -0,0 +1,251 @@
+"""Mode batch/command-line HIDEasy tanpa antarmuka Kivy.
+
+Contoh pemakaian:
+    python cli.py embed --documents laporan/ --carrier foto/ --output hasil/
+    python cli.py embed --manifest pasangan.csv --output hasil/ --workers 8
+    python cli.py embed --documents laporan/ --carrier foto/ --mode lsb -o hasil/
+    python cli.py extract hasil/ --output dokumen/
+    python cli.py send hasil/ --host 192.168.1.20
+
+Manifest berupa CSV dengan dua kolom per baris: path dokumen, path media.
+Kunci diambil dari --key, variabel lingkungan HIDEASY_KEY, atau ditanyakan.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+import argparse
+import csv
+import getpass
+import os
+import sys
+import time
+
+import stego
+import transfer
+
+
+DOCUMENT_EXTS = ('.txt', '.docx', '.pdf')
+MEDIA_EXTS = ('.jpg', '.jpeg', '.png', '.mp3', '.wav')
+KDF_CHOICES = {'scrypt': stego.SCRYPT_PARAMS, 'pbkdf2': stego.PBKDF2_PARAMS}
+LSB_EXTS = ('.png', '.wav')
+
+
+def _list_files(path, extensions=None):
+    """Daftar file (terurut) dari sebuah file atau folder."""
+    if os.path.isfile(path):
+        return [path]
+    names = sorted(os.listdir(path))
+    return [os.path.join(path, name) for name in names
+            if os.path.isfile(os.path.join(path, name))
+            and (extensions is None or name.lower().endswith(extensions))]
+
+
+def _read_manifest(path):
+    """Pasangan (dokumen, media) dari file CSV; path relatif terhadap manifest."""
+    base = os.path.dirname(os.path.abspath(path))
+    pairs = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('#'):
+                continue
+            if len(row) < 2:
+                raise SystemExit(f"Baris manifest tidak valid: {row}")
+            document, carrier = (os.path.join(base, p.strip()) for p in row[:2])
+            pairs.append((document, carrier))
+    return pairs
+
+
+def _embed_pairs(args):
+    if args.manifest:
+        return _read_manifest(args.manifest)
+    if not args.documents or not args.carrier:
+        raise SystemExit("Gunakan --manifest atau --documents bersama --carrier.")
+    documents = _list_files(args.documents, DOCUMENT_EXTS)
+    carriers = _list_files(args.carrier, LSB_EXTS if args.mode == 'lsb' else MEDIA_EXTS)
+    if not carriers:
+        raise SystemExit("Tidak ada file media yang ditemukan.")
+    # Media dipakai bergiliran bila jumlahnya lebih sedikit dari dokumen
+    return [(doc, carriers[i % len(carriers)]) for i, doc in enumerate(documents)]
+
+
+def _create_unique(path):
+    """Membuka file baru untuk ditulis tanpa menimpa file yang sudah ada.
+
+    Bila nama sudah dipakai (file lama, atau worker lain di batch yang sama),
+    ditambahkan akhiran ' (2)', ' (3)', dan seterusnya. Pembuatan file
+    eksklusif sehingga aman antarproses.
+    """
+    base, ext = os.path.splitext(path)
+    counter = 1
+    while True:
+        candidate = path if counter == 1 else f"{base} ({counter}){ext}"
+        try:
+            return open(candidate, 'xb')
+        except FileExistsError:
+            counter += 1
+
+
+@contextmanager
+def _output_file(path):
+    """File keluaran unik yang dihapus lagi bila penulisan gagal."""
+    out = _create_unique(path)
+    try:
+        with out:
+            yield out
+    except BaseException:
+        os.remove(out.name)
+        raise
+
+
+def _embed_job(document, carrier, output_dir, key, compression, mode):
+    """Dijalankan di worker process: menyisipkan satu dokumen.
+
+    `key` berupa `stego.DerivedKey` yang sudah diturunkan di proses utama.
+    Mode 'lsb' memakai modul lsb (numpy dan Pillow), yang baru diimpor di sini.
+    """
+    start = time.perf_counter()
+    doc_name = os.path.splitext(os.path.basename(document))[0]
+    out_path = os.path.join(output_dir, f"{doc_name}_{stego.stego_filename(carrier)}")
+    # Paralelisme sudah di tingkat proses; satu thread per file cukup
+    with _output_file(out_path) as out:
+        if mode == 'lsb':
+            import lsb
+            lsb.embed_to(document, carrier, key, out, workers=1, compression=compression)
+        else:
+            stego.embed_to(document, carrier, key, out, workers=1, compression=compression)
+    return out.name, os.path.getsize(out.name), time.perf_counter() - start
+
+
+def _extract_job(stego_path, output_dir, key):
+    """Dijalankan di worker process: mengekstrak satu file stego."""
+    start = time.perf_counter()
+    filename, payload = stego.extract(stego_path, key, workers=1)
+    # Dua file stego bisa berisi dokumen bernama sama
+    with _output_file(os.path.join(output_dir, os.path.basename(filename))) as f:
+        f.write(payload)
+    return f.name, os.path.getsize(stego_path), time.perf_counter() - start
+
+
+def _run(jobs, workers):
+    """Menjalankan job di process pool, mencetak progres dan ringkasan throughput."""
+    total = len(jobs)
+    done = failed = processed = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(func, *job_args): job_args[0] for func, job_args in jobs}
+        for future in as_completed(futures):
+            done += 1
+            source = os.path.basename(futures[future])
+            try:
+                out_path, size, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{total}] GAGAL {source}: {e}", file=sys.stderr)
+                continue
+            processed += size
+            print(f"[{done}/{total}] {source} -> {os.path.basename(out_path)} "
+                  f"({size / 1e6:.2f} MB, {seconds:.3f} detik)")
+
+    elapsed = time.perf_counter() - start
+    throughput = processed / 1e6 / elapsed if elapsed else 0.0
+    print(f"Selesai: {total - failed} berhasil, {failed} gagal, "
+          f"{processed / 1e6:.2f} MB dalam {elapsed:.2f} detik ({throughput:.2f} MB/s)")
+    return 1 if failed else 0
+
+
+def _get_key(args):
+    key = args.key or os.environ.get('HIDEASY_KEY') or getpass.getpass("Kunci: ")
+    if not key:
+        raise SystemExit("Masukkan kunci enkripsi!")
+    return key
+
+
+def cmd_embed(args):
+    pairs = _embed_pairs(args)
+    # KDF dijalankan sekali untuk seluruh batch, bukan per file
+    key = stego.derive_key(_get_key(args), KDF_CHOICES[args.kdf])
+    os.makedirs(args.output, exist_ok=True)
+    jobs = [(_embed_job, (doc, carrier, args.output, key, args.compression, args.mode))
+            for doc, carrier in pairs]
+    return _run(jobs, args.workers)
+
+
+def cmd_extract(args):
+    files = [path for source in args.inputs for path in _list_files(source)]
+    key = _get_key(args)
+    os.makedirs(args.output, exist_ok=True)
+    jobs = [(_extract_job, (path, args.output, key)) for path in files]
+    return _run(jobs, args.workers)
+
+
+def cmd_send(args):
+    files = [path for source in args.inputs for path in _list_files(source)]
+    if not files:
+        raise SystemExit("Tidak ada file yang dikirim.")
+    total = len(files)
+    done = [0]
+
+    def on_file_done(path, ok):
+        done[0] += 1
+        status = "" if ok else "GAGAL "
+        print(f"[{done[0]}/{total}] {status}{os.path.basename(path)}",
+              file=sys.stdout if ok else sys.stderr)
+
+    metrics = transfer.TransferMetrics('send')
+    try:
+        result = transfer.send_files(files, args.host, args.port, on_file_done=on_file_done,
+                                     metrics=metrics)
+    finally:
+        if args.log:
+            metrics.write_log(args.log)
+    print(f"Selesai: {len(result.succeeded)} berhasil, {len(result.failed)} gagal, "
+          f"{result.bytes / 1e6:.2f} MB dalam {result.seconds:.2f} detik "
+          f"({result.throughput / 1e6:.2f} MB/s)")
+    for path, error in result.errors.items():
+        print(f"{os.path.basename(path)}: {error}", file=sys.stderr)
+    return 1 if result.failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="hideasy", description="HIDEasy mode batch")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--output', '-o', required=True, help="folder hasil")
+    common.add_argument('--key', '-k', help="kunci enkripsi/dekripsi")
+    common.add_argument('--workers', '-j', type=int, default=os.cpu_count(),
+                        help="jumlah worker process (default: jumlah CPU)")
+
+    embed = sub.add_parser('embed', parents=[common], help="sisipkan dokumen ke media")
+    embed.add_argument('--manifest', '-m', help="CSV berisi pasangan dokumen,media")
+    embed.add_argument('--documents', '-d', help="file atau folder dokumen")
+    embed.add_argument('--carrier', '-c', help="file atau folder media")
+    embed.add_argument('--kdf', choices=sorted(KDF_CHOICES), default='scrypt',
+                       help="fungsi penurunan kunci (default: scrypt)")
+    embed.add_argument('--compression', choices=['auto'] + sorted(stego.COMPRESSION_CODECS),
+                       default='auto', help="kompresi dokumen sebelum enkripsi (default: auto)")
+    embed.add_argument('--mode', choices=['append', 'lsb'], default='append',
+                       help="append: sisip di akhir media; lsb: bit terendah PNG/WAV "
+                            "(ukuran media tetap, kapasitas terbatas)")
+    embed.set_defaults(func=cmd_embed)
+
+    extract = sub.add_parser('extract', parents=[common], help="ambil dokumen dari file stego")
+    extract.add_argument('inputs', nargs='+', help="file atau folder stego")
+    extract.set_defaults(func=cmd_extract)
+
+    send = sub.add_parser('send', help="kirim file ke receiver lewat satu koneksi")
+    send.add_argument('inputs', nargs='+', help="file atau folder yang dikirim")
+    send.add_argument('--host', required=True, help="IP receiver")
+    send.add_argument('--port', type=int, default=transfer.PORT)
+    send.add_argument('--log', help="tambahkan metrik transfer ke file JSON-lines ini")
+    send.set_defaults(func=cmd_send)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Pemindaian folder untuk pemilih file HIDEasy, tanpa Kivy.
+
+os.scandir membaca jenis entri langsung dari direktori, sehingga folder
+berisi ribuan foto tidak perlu di-stat satu per satu. Filter ekstensi
+diterapkan selama pemindaian, dan hasilnya di-cache per (folder, filter).
+Cache dianggap basi begitu mtime folder berubah (ada file yang ditambah,
+dihapus, atau diganti nama). Pemindaian berjalan di thread latar; pemanggil
+dari UI bertanggung jawab meneruskan hasilnya ke Clock Kivy.
+
+RecentFiles menyimpan daftar file yang terakhir dipilih sebagai JSON.
+"""
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import threading
+
+
+Entry = namedtuple('Entry', 'name path is_dir')
+
+
+def scan_directory(path, extensions=None, show_hidden=False):
+    """Isi folder: subfolder lebih dulu, lalu file, masing-masing urut nama.
+
+    `extensions` berupa tuple akhiran huruf kecil (mis. ('.jpg', '.png'));
+    None berarti semua file. Subfolder selalu disertakan agar tetap bisa
+    dibuka.
+    """
+    dirs, files = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not show_hidden and entry.name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue  # entri hilang atau tidak bisa dibaca saat dipindai
+            if is_dir:
+                dirs.append(Entry(entry.name, entry.path, True))
+            elif extensions is None or entry.name.lower().endswith(extensions):
+                files.append(Entry(entry.name, entry.path, False))
+
+    def by_name(entry):
+        return entry.name.lower()
+
+    return sorted(dirs, key=by_name) + sorted(files, key=by_name)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class DirectoryCache:
+    """Cache hasil scan_directory dengan invalidasi berdasarkan mtime folder.
+
+    Hanya `max_dirs` folder terakhir yang disimpan. Pemindaian folder yang
+    sama selagi masih berjalan digabung menjadi satu.
+    """
+
+    def __init__(self, max_dirs=64):
+        self.max_dirs = max_dirs
+        self._entries = OrderedDict()  # (path, extensions) -> (mtime, [Entry])
+        self._scans = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hideasy-scan')
+
+    @staticmethod
+    def _key(path, extensions):
+        return os.path.abspath(path), extensions
+
+    def get(self, path, extensions=None):
+        """Isi folder dari cache bila mtime-nya belum berubah, selain itu None."""
+        key = self._key(path, extensions)
+        mtime = _mtime(key[0])
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or mtime is None or cached[0] != mtime:
+                return None
+            self._entries.move_to_end(key)
+            return cached[1]
+
+    def scan(self, path, extensions=None, callback=None):
+        """Memindai folder di thread latar dan menyimpan hasilnya di cache.
+
+        `callback(entries, error)` dipanggil dari thread pemindai; salah satu
+        argumennya None. Mengembalikan Future.
+        """
+        key = self._key(path, extensions)
+        with self._lock:
+            future = self._scans.get(key)
+            if future is None:
+                future = self._scans[key] = self._pool.submit(self._scan, key)
+        if callback:
+            def done(future):
+                error = future.exception()
+                callback(None if error else future.result(), error)
+            future.add_done_callback(done)
+        return future
+
+    def invalidate(self, path=None):
+        """Membuang cache satu folder (semua filter), atau seluruhnya bila None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path = os.path.abspath(path)
+            for key in [key for key in self._entries if key[0] == path]:
+                del self._entries[key]
+
+    def _scan(self, key):
+        path, extensions = key
+        try:
+            # mtime dibaca sebelum scandir: perubahan selama pemindaian
+            # membuat hasilnya langsung basi, bukan terlewat
+            mtime = _mtime(path)
+            entries = scan_directory(path, extensions)
+            with self._lock:
+                self._entries[key] = (mtime, entries)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_dirs:
+                    self._entries.popitem(last=False)
+            return entries
+        finally:
+            with self._lock:
+                self._scans.pop(key, None)
+
+
+class RecentFiles:
+    """Daftar file yang terakhir dipilih (terbaru di depan), disimpan di `path`."""
+
+    def __init__(self, path, limit=10):
+        self.path = path
+        self.limit = limit
+        self._paths = None
+
+    def _load(self):
+        if self._paths is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._paths = [p for p in json.load(f) if isinstance(p, str)]
+            except (OSError, ValueError, TypeError):
+                self._paths = []
+        return self._paths
+
+    def add(self, paths):
+        recent = self._load()
+        for path in reversed(paths):
+            path = os.path.abspath(path)
+            if path in recent:
+                recent.remove(path)
+            recent.insert(0, path)
+        del recent[self.limit:]
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(recent, f)
+        except OSError:
+            pass  # daftar terbaru hanya kemudahan; gagal simpan tidak fatal
+
+    def existing(self, extensions=None):
+        """File terbaru yang masih ada dan cocok dengan filter ekstensi."""
+        return [path for path in self._load()
+                if (extensions is None or path.lower().endswith(extensions))
+                and os.path.isfile(path)]
@@ -0,0 +1,360 @@
+"""Mode LSB HIDEasy: payload disimpan di bit terendah piksel PNG atau sampel WAV.
+
+Mode sisip biasa menambahkan payload di akhir media sehingga mudah dikenali
+dan ukuran file bertambah sebesar dokumen. Di mode ini payload format 4 yang
+sama (header + segmen AES-GCM + trailer, dibuat stego.embed_to dengan media
+kosong) didahului panjangnya (8 byte), lalu setiap bitnya menggantikan bit
+terendah satu byte media:
+
+    PNG: kanal R, G, B setiap piksel (alpha tidak disentuh), atau kanal
+         tunggal untuk gambar grayscale. Mode lain dikonversi ke RGB/RGBA.
+    WAV: byte terendah setiap sampel PCM (8, 16, 24, atau 32 bit).
+
+Bit dikemas dan diurai dengan numpy.unpackbits/packbits pada array media,
+tanpa loop Python per piksel. Kapasitas dibaca dari header media saja
+(ukuran gambar, jumlah frame) sehingga dokumen yang terlalu besar ditolak
+sebelum media didekode. Ekstraksi cukup lewat stego.extract, yang mengenali
+media LSB dengan sendirinya: 12 byte pertama payload (panjang + signature)
+diuji dari baris piksel/frame pertama saja, sehingga PNG/WAV biasa tidak
+perlu didekode seluruhnya.
+"""
+from io import BytesIO, RawIOBase
+import math
+import os
+import struct
+import wave
+import zlib
+
+import numpy as np
+from PIL import Image
+
+import stego
+
+
+_LENGTH = struct.Struct('>Q')
+_SIGNATURE = stego.MARKER + bytes([stego.FORMAT_SEGMENTED])  # awal setiap payload
+_HEAD_SIZE = _LENGTH.size + len(_SIGNATURE)
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_CHUNK = struct.Struct('>I4s')
+_PNG_IHDR = struct.Struct('>IIBBBBB')
+_PNG_CHANNELS = {0: 1, 2: 3, 6: 4}  # color type 8 bit yang ditulis embed_to (L, RGB, RGBA)
+_READ_SIZE = 64 * 1024
+_IMAGE_MODES = ('L', 'RGB', 'RGBA')
+_BITS_CHUNK = 1024 * 1024  # byte payload yang diurai menjadi bit sekaligus
+# Bit terendah yang acak membuat pencarian string zlib sia-sia; Z_RLE
+# menghasilkan ukuran yang sama dengan waktu enkode jauh lebih singkat
+_PNG_OPTIONS = {'compress_type': zlib.Z_RLE}
+
+
+class CapacityError(stego.StegoError):
+    """Dokumen tidak muat di bit terendah media."""
+
+
+class _BufferReader(RawIOBase):
+    """File object baca-saja di atas bytes/mmap tanpa menyalin isinya."""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        end = min(self._position + len(target), len(self._view))
+        count = max(0, end - self._position)
+        target[:count] = self._view[self._position:end]
+        self._position += count
+        return count
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        # mmap pemanggil hanya bisa ditutup setelah view dilepas
+        self._view.release()
+        super().close()
+
+
+def _source(source):
+    """Path atau file object yang bisa dibuka Pillow/wave dari berbagai sumber."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if hasattr(source, 'read'):
+        return source
+    return _BufferReader(source)  # bytes, memoryview, atau mmap
+
+
+def _kind(source):
+    """'png' atau 'wav' menurut signature media."""
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            head = f.read(12)
+    else:
+        position = source.tell()
+        head = source.read(12)
+        source.seek(position)
+    if head[:8] == _PNG_SIGNATURE:
+        return 'png'
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    raise stego.StegoError("Mode LSB hanya mendukung media PNG atau WAV.")
+
+
+def _image_mode(image):
+    if image.mode in _IMAGE_MODES:
+        return image.mode
+    if 'A' in image.getbands() or 'transparency' in image.info:
+        return 'RGBA'
+    return 'RGB'
+
+
+def _wav_params(source):
+    try:
+        with wave.open(source, 'rb') as reader:
+            return reader.getparams()
+    except (wave.Error, EOFError) as e:
+        raise stego.StegoError(f"WAV tidak didukung (hanya PCM): {e}")
+
+
+def capacity(carrier) -> int:
+    """Jumlah byte payload yang muat di media, dihitung dari header-nya saja."""
+    source = _source(carrier)
+    position = None if isinstance(source, str) else source.tell()
+    if _kind(source) == 'png':
+        with Image.open(source) as image:
+            channels = 1 if _image_mode(image) == 'L' else 3
+            slots = image.width * image.height * channels
+    else:
+        params = _wav_params(source)
+        slots = params.nframes * params.nchannels
+    if position is not None:
+        source.seek(position)  # file object media dibaca lagi saat embed
+    return max(0, slots // 8 - _LENGTH.size)
+
+
+def _open_png(source):
+    """(byte pembawa bit, fungsi simpan) untuk gambar PNG."""
+    with Image.open(source) as image:
+        mode = _image_mode(image)
+        info = {key: image.info[key] for key in ('icc_profile', 'dpi') if key in image.info}
+        pixels = np.array(image if image.mode == mode else image.convert(mode))
+    # Kanal alpha dilewati; untuk RGBA kanal warna disalin ke array datar
+    # lalu dikembalikan saat disimpan
+    cover = pixels[..., :3].reshape(-1) if mode == 'RGBA' else pixels.reshape(-1)
+
+    def save(output):
+        if mode == 'RGBA':
+            pixels[..., :3] = cover.reshape(pixels.shape[:2] + (3,))
+        Image.fromarray(pixels, mode).save(output, format='PNG', **_PNG_OPTIONS, **info)
+    return cover, save
+
+
+def _open_wav(source):
+    """(byte pembawa bit, fungsi simpan) untuk audio WAV PCM."""
+    try:
+        with wave.open(source, 'rb') as reader:
+            params = reader.getparams()
+            frames = bytearray(reader.readframes(params.nframes))
+    except (wave.Error, EOFError) as e:
+        raise stego.StegoError(f"WAV tidak didukung (hanya PCM): {e}")
+    # Sampel little-endian: byte pertama setiap sampel memuat bit terendahnya
+    cover = np.frombuffer(frames, dtype=np.uint8)[::params.sampwidth]
+
+    def save(output):
+        with wave.open(output, 'wb') as writer:
+            writer.setparams(params)
+            writer.writeframes(frames)
+    return cover, save
+
+
+def _open(carrier):
+    source = _source(carrier)
+    return _open_png(source) if _kind(source) == 'png' else _open_wav(source)
+
+
+def _png_prefix(f, count):
+    """`count` byte pembawa pertama PNG, hanya dari baris piksel yang dibutuhkan.
+
+    IDAT didekompresi sebagian dan filter PNG dibalik hanya untuk awal
+    setiap baris. Mengembalikan b'' bila PNG tidak mungkin hasil embed_to
+    (bukan 8 bit L/RGB/RGBA, atau interlaced).
+    """
+    if f.read(len(_PNG_SIGNATURE)) != _PNG_SIGNATURE:
+        return b''
+    length, kind = _PNG_CHUNK.unpack(f.read(_PNG_CHUNK.size))
+    if kind != b'IHDR' or length != _PNG_IHDR.size:
+        return b''
+    width, height, depth, color, _, _, interlace = _PNG_IHDR.unpack(f.read(length))
+    channels = _PNG_CHANNELS.get(color)
+    if depth != 8 or channels is None or interlace or not width:
+        return b''
+    f.seek(4, os.SEEK_CUR)  # CRC
+    used = min(channels, 3)
+    wanted = math.ceil(count / used)  # piksel yang dibutuhkan
+    rows = math.ceil(wanted / width)
+    if rows > height:
+        return b''
+    stride = width * channels
+    needed = rows * (stride + 1)
+    decompressor = zlib.decompressobj()
+    raw = bytearray()
+    while len(raw) < needed:
+        length, kind = _PNG_CHUNK.unpack(f.read(_PNG_CHUNK.size))
+        if kind == b'IEND':
+            return b''
+        if kind != b'IDAT':
+            f.seek(length + 4, os.SEEK_CUR)
+            continue
+        while length and len(raw) < needed:
+            data = f.read(min(length, _READ_SIZE))
+            if not data:
+                return b''
+            length -= len(data)
+            raw += decompressor.decompress(data, needed - len(raw))
+            while decompressor.unconsumed_tail and len(raw) < needed:
+                raw += decompressor.decompress(decompressor.unconsumed_tail, needed - len(raw))
+        f.seek(length + 4, os.SEEK_CUR)
+
+    # Byte ke-i sebuah baris hanya bergantung pada byte sebelum i di baris
+    # itu dan baris di atasnya, jadi cukup awal baris yang dibalik filternya
+    span = min(width, wanted) * channels
+    pixels = bytearray()
+    previous = bytearray(span)
+    for row in range(rows):
+        start = row * (stride + 1)
+        method, line = raw[start], raw[start + 1:start + 1 + span]
+        if method > 4:
+            return b''
+        for i in range(span):
+            a = line[i - channels] if i >= channels else 0
+            b = previous[i]
+            if method == 1:
+                line[i] = (line[i] + a) & 0xFF
+            elif method == 2:
+                line[i] = (line[i] + b) & 0xFF
+            elif method == 3:
+                line[i] = (line[i] + (a + b) // 2) & 0xFF
+            elif method == 4:
+                c = previous[i - channels] if i >= channels else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                predictor = a if pa <= pb and pa <= pc else b if pb <= pc else c
+                line[i] = (line[i] + predictor) & 0xFF
+        pixels += line[:min(width, wanted - row * width) * channels]
+        previous = line
+    if channels == 4:
+        # Alpha tidak membawa bit, sama seperti cover di _open_png
+        pixels = bytes(pixels[i] for i in range(len(pixels)) if i % 4 != 3)
+    return bytes(pixels[:count])
+
+
+def _wav_prefix(f, count):
+    """`count` byte pembawa pertama WAV, hanya dari frame yang dibutuhkan."""
+    with wave.open(f, 'rb') as reader:
+        params = reader.getparams()
+        frames = reader.readframes(math.ceil(count / params.nchannels))
+    return frames[::params.sampwidth][:count]
+
+
+def _has_head(source):
+    """True bila bit terendah awal media berisi panjang + signature payload."""
+    prefix = _png_prefix if _kind(source) == 'png' else _wav_prefix
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            cover = prefix(f, _HEAD_SIZE * 8)
+    else:
+        position = source.tell()
+        try:
+            cover = prefix(source, _HEAD_SIZE * 8)
+        finally:
+            source.seek(position)
+    if len(cover) < _HEAD_SIZE * 8:
+        return False
+    head = _read_bytes(np.frombuffer(cover, dtype=np.uint8), 0, _HEAD_SIZE)
+    return head[_LENGTH.size:] == _SIGNATURE
+
+
+def _write_bits(cover, payload, tracker):
+    data = np.frombuffer(payload, dtype=np.uint8)
+    for start in range(0, data.size, _BITS_CHUNK):
+        tracker.advance()
+        bits = np.unpackbits(data[start:start + _BITS_CHUNK])
+        target = cover[start * 8:start * 8 + bits.size]
+        target &= 0xFE
+        target |= bits
+
+
+def _read_bytes(cover, start, count):
+    return np.packbits(cover[start * 8:(start + count) * 8] & 1).tobytes()
+
+
+def embed_to(document, carrier, key, output, filename: str = None,
+             compression: str = 'auto', progress=None, cancel=None, **options):
+    """Menyisipkan dokumen ke bit terendah media PNG/WAV dan menulis hasilnya ke `output`.
+
+    Kapasitas diperiksa lebih dulu dari header media; CapacityError dilempar
+    sebelum dokumen dienkripsi bila dokumen tidak muat (atau, bila dokumen
+    akan dikompresi, segera setelah payload terenkripsi diketahui ukurannya).
+    `progress` dan `cancel` berlaku selama enkripsi; opsi lain diteruskan ke
+    stego.embed_to. Ukuran dan format media tidak berubah. Mengembalikan
+    jumlah byte payload yang disisipkan.
+    """
+    available = capacity(carrier)
+    needed = stego.payload_size(document, filename, options.get('chunk_size', stego.CHUNK_SIZE))
+    if needed > available and (compression == 'none' or compression == 'auto'
+                               and stego.choose_codec(document) == stego.CODEC_NONE):
+        raise CapacityError(f"Media terlalu kecil: butuh {needed} byte, "
+                            f"tersedia {available} byte.")
+
+    buffer = BytesIO()
+    buffer.write(bytes(_LENGTH.size))
+    size = stego.embed_to(document, b'', key, buffer, filename=filename,
+                          compression=compression, progress=progress, cancel=cancel, **options)
+    if size > available:
+        raise CapacityError(f"Media terlalu kecil: butuh {size} byte, tersedia {available} byte.")
+    payload = buffer.getbuffer()
+    payload[:_LENGTH.size] = _LENGTH.pack(size)
+
+    tracker = stego._Progress(None, cancel, 0)
+    cover, save = _open(carrier)
+    _write_bits(cover, payload, tracker)
+    del payload
+    tracker.advance()
+    save(output)
+    return size
+
+
+def read_payload(stego_data):
+    """Payload format 4 dari bit terendah media, atau None bila tidak ada.
+
+    Media baru didekode seluruhnya setelah awal payload ditemukan di baris
+    piksel/frame pertama.
+    """
+    source = _source(stego_data)
+    try:
+        if not _has_head(source):
+            return None
+        cover, _ = _open(source)
+    except (stego.StegoError, OSError, ValueError, EOFError, struct.error, wave.Error,
+            zlib.error, Image.DecompressionBombError):
+        return None  # bukan PNG/WAV yang bisa didekode
+    finally:
+        if isinstance(source, _BufferReader):
+            source.close()
+    head = _read_bytes(cover, 0, _HEAD_SIZE)
+    if len(head) < _HEAD_SIZE or head[_LENGTH.size:] != _SIGNATURE:
+        return None
+    (size,) = _LENGTH.unpack_from(head)
+    if size > cover.size // 8 - _LENGTH.size:
+        return None
+    return _read_bytes(cover, _LENGTH.size, size)
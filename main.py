@@ -1,54 +1,205 @@
+import time
+_PROCESS_START = time.perf_counter()  # awal pengukuran cold start (setelah interpreter siap)
+
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.label import Label
 from kivy.core.text import LabelBase
 from kivy.uix.button import Button
 from kivy.properties import StringProperty, BooleanProperty, NumericProperty
-from kivy.properties import ObjectProperty
-from kivy.uix.behaviors import ButtonBehavior
-from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
-from kivy.uix.filechooser import FileChooserListView 
-from kivy.core.clipboard import Clipboard
-from kivy.uix.filechooser import FileChooserIconView
 from kivy.lang import Builder 
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
-from kivy.metrics import dp
-from kivy.core.window import Window
 from kivy.factory import Factory
-from Crypto.Random import get_random_bytes
 from datetime import datetime
-import time
 from kivy.utils import platform
-from io import BytesIO
+import filescan
+import importlib
+import json
 import shutil
 import socket
-import string
+import tempfile
 import threading
 import os
 from os.path import expanduser, join
 
 
+class _LazyModule:
+    """Modul yang baru diimpor saat atributnya pertama kali dipakai.
+
+    stego dan transfer menarik PyCryptodome; keduanya tidak dibutuhkan
+    untuk menggambar splash dan halaman utama.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+stego = _LazyModule('stego')
+transfer = _LazyModule('transfer')
+# kivy.uix.filechooser (beserta aturan kv-nya) baru dimuat saat popup dibuka
+chooser_fs = _LazyModule('chooser_fs')
+lsb = _LazyModule('lsb')
+
+
 LabelBase.register(name="FontAwesome", fn_regular="assets/FontAwesome_Regular.ttf")
 LabelBase.register(name="FontAwesomeSolid", fn_regular="assets/FontAwesome_Solid.ttf")
 LabelBase.register(name="FontText", fn_regular="assets/customFont.ttf")
 
-def adjust_key_length(user_key: str, target_length: int = 24) -> bytes:
-    """Menyesuaikan panjang kunci untuk AES 192-bit."""
-    key_bytes = user_key.encode('utf-8')
 
-    if len(key_bytes) < target_length:
-        padded_key = pad(key_bytes, target_length)[:target_length]
-    else:
-        padded_key = key_bytes[:target_length]
+class StartupTimer:
+    """Mencatat waktu cold start per tahap, dihitung dari awal impor main.py."""
+
+    def __init__(self):
+        self.marks = []  # (tahap, detik sejak _PROCESS_START)
+        self.screens = {}  # nama screen -> detik untuk membuatnya
+        self.reported = False
+
+    def mark(self, stage):
+        self.marks.append((stage, time.perf_counter() - _PROCESS_START))
+
+    def screen_built(self, name, seconds):
+        self.screens[name] = seconds
+        if self.reported:
+            # Screen yang dibuat setelah startup (navigasi pertama)
+            print(f"[startup] screen {name} dibuat dalam {seconds * 1000:.1f} ms")
+
+    def report(self, path=None):
+        """Mencetak laporan dan menambahkannya ke `path` (JSON-lines) bila diisi."""
+        self.reported = True
+        previous = 0.0
+        for stage, seconds in self.marks:
+            print(f"[startup] {stage:<20} {seconds * 1000:8.1f} ms (+{(seconds - previous) * 1000:.1f})")
+            previous = seconds
+        for name, seconds in self.screens.items():
+            print(f"[startup]   screen {name:<13} {seconds * 1000:8.1f} ms")
+        if path:
+            entry = {'time': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+                     'platform': platform,
+                     'marks': {stage: round(seconds, 4) for stage, seconds in self.marks},
+                     'screens': {name: round(seconds, 4) for name, seconds in self.screens.items()}}
+            try:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+            except OSError as e:
+                print("Log startup gagal ditulis:", e)
+
+
+startup_timer = StartupTimer()
+startup_timer.mark('imports')
+
+
+def transfer_log_path():
+    """File log metrik transfer (JSON-lines) di folder data aplikasi."""
+    return os.path.join(App.get_running_app().user_data_dir, "transfer_log.jsonl")
+
+
+def received_dir():
+    """Folder file sementara receiver (setengah jadi dan hasil terima) di data aplikasi."""
+    path = os.path.join(App.get_running_app().user_data_dir, "received")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def new_temp_path(filename):
+    """Path untuk file hasil sementara di folder unik dalam data aplikasi.
+
+    Nama file dipertahankan karena ikut dikirim ke receiver, tetapi tidak
+    bisa bentrok dengan file milik pengguna.
+    """
+    folder = tempfile.mkdtemp(prefix="hideasy_", dir=App.get_running_app().user_data_dir)
+    return os.path.join(folder, filename)
+
+
+def remove_temp_path(path):
+    """Menghapus file dari new_temp_path (bila masih ada) beserta foldernya."""
+    if not path:
+        return
+    if os.path.exists(path):
+        os.remove(path)
+    try:
+        os.rmdir(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+def format_metrics(metrics):
+    """Ringkasan progres satu baris: persen, laju, sisa waktu."""
+    parts = []
+    if metrics.fraction is not None:
+        parts.append(f"{metrics.fraction * 100:.0f}%")
+    parts.append(f"{metrics.rate / 1e6:.1f} MB/s")
+    if metrics.eta is not None:
+        parts.append(f"sisa {metrics.eta:.0f} dtk")
+    if metrics.retries:
+        parts.append(f"sambung ulang {metrics.retries}x")
+    return " | ".join(parts)
 
-    return padded_key
+class BaseScreen(Screen):
+    task_cancel = None  # Event pembatalan tugas latar yang sedang berjalan
 
+    def reset_screen(self):
+        """Mengosongkan state per operasi tanpa membangun ulang widget.
+
+        Mengembalikan False bila screen belum punya reset sendiri, sehingga
+        reload_screen membangunnya ulang dari aturan kv.
+        """
+        return False
+
+    def run_task(self, message, work, on_done):
+        """Menjalankan `work(progress, cancel)` di thread latar dengan popup progres.
+
+        `progress(selesai, total)` dipanggil dari thread latar dan hanya
+        menyimpan angka; popup membacanya lewat Clock sehingga UI tidak
+        dibanjiri callback. Tombol Batal mengaktifkan `cancel`.
+        `on_done(hasil, error)` dipanggil di thread UI.
+        """
+        if self.task_cancel is not None:
+            return
+        cancel = self.task_cancel = threading.Event()
+        state = [0, 0]  # selesai, total
+        popup = Factory.TaskProgressPopup()
+        popup.ids.message_label.text = message
+
+        def on_cancel(*args):
+            cancel.set()
+            popup.ids.cancel_button.disabled = True
+            popup.ids.message_label.text = "Membatalkan..."
+
+        def refresh(dt):
+            done, total = state
+            if total:
+                popup.ids.progress_bar.value = done * 100 / total
+
+        def progress(done, total):
+            state[:] = done, total
+
+        def finish(result, error):
+            event.cancel()
+            popup.dismiss()
+            self.task_cancel = None
+            on_done(result, error)
+
+        def run():
+            try:
+                result = work(progress, cancel)
+            except Exception as e:
+                error = e  # `e` tidak bisa dipakai lagi setelah blok except
+                Clock.schedule_once(lambda dt: finish(None, error))
+            else:
+                Clock.schedule_once(lambda dt: finish(result, None))
+
+        popup.ids.cancel_button.bind(on_release=on_cancel)
+        popup.open()
+        event = Clock.schedule_interval(refresh, 0.1)
+        threading.Thread(target=run, daemon=True).start()
 
-class BaseScreen(Screen):
     def show_message(self, message, title="Pesan", duration=None):
         popup = Factory.MessagePopup()
         popup.title = title
@@ -65,13 +216,40 @@ class BaseScreen(Screen):
         popup.open()
         return popup
 
+FILE_TYPE_EXTENSIONS = {
+    "Dokumen": ('.txt', '.docx', '.pdf'),
+    "Media": ('.jpg', '.jpeg', '.png', '.mp3', '.wav'),
+    "DecryptMedia": ('.jpg', '.jpeg', '.png', '.mp3', '.wav'),
+}
+_recent_files = None
+
+
+def recent_files():
+    """Daftar file terakhir dipilih, disimpan di folder data aplikasi."""
+    global _recent_files
+    if _recent_files is None:
+        _recent_files = filescan.RecentFiles(
+            os.path.join(App.get_running_app().user_data_dir, "recent_files.json"))
+    return _recent_files
+
+
 class FileChooserPopup(Popup):
-    def __init__(self, file_type=None, parent_screen=None, on_select_callback=None, **kwargs):
+    last_paths = {}  # folder terakhir per file_type selama aplikasi berjalan
+
+    def __init__(self, file_type=None, parent_screen=None, on_select_callback=None, multiselect=False, **kwargs):
         super().__init__(**kwargs)
         self.title = f"Pilih File {file_type.capitalize() if file_type else ''}"
         self.file_type = file_type  # Simpan file_type agar bisa digunakan nanti
         self.parent_screen = parent_screen
         self.on_select_callback= on_select_callback
+        self.multiselect = multiselect
+        self.recent_paths = []
+        self.file_system = chooser_fs.CachedFileSystem(on_scanned=self.on_scanned)
+        chooser = self.ids.file_chooser
+        # Ditetapkan sebelum frame pertama agar FileChooser tidak sempat
+        # membaca folder secara sinkron dengan FileSystemLocal
+        chooser.file_system = self.file_system
+        chooser.bind(files=lambda *args: self.update_status())
     
     def on_open(self):  
         # Dipanggil ketika popup terbuka
@@ -80,36 +258,83 @@ class FileChooserPopup(Popup):
                     default_path ="/sdcard/" 
                 else:
                     default_path = os.path.expanduser("~")
-                self.ids.file_chooser.path = default_path
+                self.ids.file_chooser.path = self.last_paths.get(self.file_type, default_path)
 
         except Exception as e:
             print("Gagal set path default:", e)
  
+        self.ids.file_chooser.multiselect = self.multiselect
         self.set_filter()
+        self.load_recent()
 
     def set_filter(self):
-            """Atur filter berdasarkan tipe file."""
+            """Atur filter berdasarkan tipe file.
+
+            Ekstensi disaring saat folder dipindai (tanpa membedakan huruf
+            besar/kecil), bukan lewat `filters` FileChooser yang memakai
+            fnmatch per file.
+            """
             if hasattr(self, "ids") and "file_chooser" in self.ids:
-                if self.file_type == "Dokumen":
-                    self.ids.file_chooser.filters = ['*.txt', '*.docx', '*.pdf']
-                elif self.file_type  in ("Media", "DecryptMedia"):
-                    self.ids.file_chooser.filters = ['*.jpg', '*.jpeg', '*.png', '*.mp3', '*.wav']
-                else:
-                    self.ids.file_chooser.filters = ['*.*']  # Default: semua file
-                
+                extensions = FILE_TYPE_EXTENSIONS.get(self.file_type)  # None: semua file
+                self.ids.file_chooser.filters = []
+                if extensions != self.file_system.extensions:
+                    self.file_system.extensions = extensions
+                    self.ids.file_chooser._trigger_update()
+
+    def on_scanned(self, path, error):
+        chooser = self.ids.file_chooser
+        if error:
+            print("Gagal membaca folder:", error)
+            self.file_system.scanning = False
+            self.ids.status_label.text = "Folder tidak bisa dibaca."
+        elif os.path.normpath(chooser.path) == path:
+            chooser._update_files()
+
+    def load_more(self):
+        self.file_system.limit += chooser_fs.PAGE_SIZE
+        self.ids.file_chooser._update_files()
+
+    def update_status(self):
+        fs = self.file_system
+        remaining = fs.total - fs.limit
+        self.ids.load_more_button.disabled = remaining <= 0
+        self.ids.load_more_button.opacity = 1 if remaining > 0 else 0
+        self.ids.load_more_button.text = f"Muat lagi ({remaining} lainnya)"
+        if fs.scanning:
+            self.ids.status_label.text = "Memindai folder..."
+        elif remaining > 0:
+            self.ids.status_label.text = f"{fs.limit} dari {fs.total} item"
+        else:
+            self.ids.status_label.text = f"{fs.total} item"
+
+    def load_recent(self):
+        self.recent_paths = recent_files().existing(FILE_TYPE_EXTENSIONS.get(self.file_type))
+        spinner = self.ids.recent_spinner
+        spinner.values = [os.path.basename(path) for path in self.recent_paths]
+        spinner.disabled = not self.recent_paths
+
+    def select_recent(self, index):
+        if 0 <= index < len(self.recent_paths):
+            self.choose([self.recent_paths[index]])
+
     def on_select(self):
         selected = self.ids.file_chooser.selection
         if selected:
-            self.dismiss()
-            # Untuk EncryptScreen
-            if self.parent_screen:
-                self.parent_screen.set_selected_file(selected[0], self.file_type)
-            # Untuk DecryptScreen
-            elif self.on_select_callback:
-                self.on_select_callback(selected)
+            self.last_paths[self.file_type] = self.ids.file_chooser.path
+            self.choose(selected)
         else:
             self.dismiss()
 
+    def choose(self, selected):
+        self.dismiss()
+        recent_files().add(selected)
+        # Untuk EncryptScreen
+        if self.parent_screen:
+            self.parent_screen.set_selected_file(selected[0], self.file_type)
+        # Untuk DecryptScreen
+        elif self.on_select_callback:
+            self.on_select_callback(selected)
+
 class CustomButton(Button):
     icon_source = StringProperty("")  # Unicode ikon (contoh: "\uf015" untuk Home)
     text_label = StringProperty("Button")  # Teks tombol
@@ -118,10 +343,16 @@ class CustomButton(Button):
 #kelas Screen Manager
 class SplashScreen(BaseScreen):
     def on_enter(self):
-        Clock.schedule_once(self.switch_to_main, 7)
+        # Frame berikutnya: splash sudah tergambar, halaman utama lalu dibuat
+        Clock.schedule_once(self.switch_to_main)
 
     def switch_to_main(self, dt):
+        startup_timer.mark('splash_shown')
         self.manager.current = 'main'
+        startup_timer.mark('main_ready')
+        if not startup_timer.reported:
+            startup_timer.report(os.path.join(App.get_running_app().user_data_dir,
+                                              "startup_log.jsonl"))
 
 
 class MainScreen(BaseScreen):
@@ -174,55 +405,58 @@ class EncryptScreen(BaseScreen):
             self.show_message("Pilih file dokumen dan media terlebih dahulu!")
             return
 
-        try:
-            start_enc = time.perf_counter()
-            secret_key = self.ids.secret_key.text
-            if not secret_key:
-                self.show_message("Masukkan kunci enkripsi!")
-                return
-
-            secret_key = adjust_key_length(secret_key)
-            iv = get_random_bytes(AES.block_size)
-
-            with open(self.document_path, "rb") as file:
-                data = file.read()
-            
-            original_filename = os.path.basename(self.document_path).encode()
-            if len(original_filename) > 65535:
-                self.show_message("Nama file terlalu panjang untuk dienkripsi.")
-                return
-            
-            filename_len = len(original_filename).to_bytes(2, 'big')  # Panjang nama file: 2 byte
-            data_with_filename = filename_len + original_filename + data
-
-            cipher = AES.new(secret_key, AES.MODE_CBC, iv)
-            encrypted_data = cipher.encrypt(pad(data_with_filename, AES.block_size))
-
-            with open(self.media_path, 'rb') as media:
-                media_data = media.read()
-
-            # Simpan hasil final ke buffer sementara
-            self.encrypted_buffer = media_data + b'E0F' + iv + encrypted_data
-
-            # Simpan nama file sementara
-            self.encrypted_filename = os.path.splitext(os.path.basename(self.media_path))[0] + "_stego" + os.path.splitext(self.media_path)[1]
-            self.ids.encrypted_file_label.text = f"File: {self.encrypted_filename}"
-            self.show_message(f"File berhasil dienkripsi dan siap diunduh.")
-
-            end_enc = time.perf_counter()
-            enc_time = end_enc - start_enc
-            print(f"Enkripsi file:{os.path.basename(self.document_path)} ke dalam {os.path.basename(self.media_path)} selesai dalam {enc_time:.3f} detik\n")
+        secret_key = self.ids.secret_key.text
+        if not secret_key:
+            self.show_message("Masukkan kunci enkripsi!")
+            return
 
-        except Exception as e:
-            self.show_message(f"Terjadi kesalahan: {str(e)}")
+        start_enc = time.perf_counter()
+        document_path, media_path = self.document_path, self.media_path
+        filename = stego.stego_filename(media_path)
+        # Hasil stego ditulis langsung ke file sementara secara streaming
+        temp_path = new_temp_path(filename)
+
+        # Mode LSB: dokumen disimpan di bit terendah piksel/sampel (.png/.wav)
+        embed_to = lsb.embed_to if self.ids.lsb_mode.active else stego.embed_to
+
+        def work(progress, cancel):
+            try:
+                # Satu core dibiarkan untuk thread UI
+                embed_to(document_path, media_path, secret_key, temp_path,
+                         workers=max(1, (os.cpu_count() or 1) - 1),
+                         progress=progress, cancel=cancel)
+            except BaseException:
+                remove_temp_path(temp_path)
+                raise
+
+        def on_done(result, error):
+            if isinstance(error, stego.Cancelled):
+                self.show_message("Enkripsi dibatalkan.", duration=2)
+            elif isinstance(error, stego.StegoError):
+                self.show_message(str(error))
+            elif error:
+                self.show_message(f"Terjadi kesalahan: {str(error)}")
+            else:
+                self.encrypted_filename = filename
+                # Hasil enkripsi sebelumnya (mis. sebelum kunci diganti) tidak terpakai lagi
+                remove_temp_path(getattr(self, 'encrypted_temp_path', None))
+                self.encrypted_temp_path = temp_path
+                self.ids.encrypted_file_label.text = f"File: {filename}"
+                self.show_message(f"File berhasil dienkripsi dan siap diunduh.")
+                enc_time = time.perf_counter() - start_enc
+                print(f"Enkripsi file:{os.path.basename(document_path)} ke dalam {os.path.basename(media_path)} selesai dalam {enc_time:.3f} detik\n")
+
+        self.run_task("Sedang mengenkripsi file...", work, on_done)
 
 
     def download_encrypted_file(self):
         """Membuka dialog pemilihan folder untuk menyimpan file."""
-        if not hasattr(self, 'encrypted_buffer') or not self.encrypted_buffer:
+        if not getattr(self, 'encrypted_temp_path', None):
             self.show_message("Tidak ada file yang dapat diunduh.")
             return
 
+        from kivy.uix.filechooser import FileChooserListView
+
         content = BoxLayout(orientation='vertical')
         file_chooser = FileChooserListView(dirselect=True)
 
@@ -243,9 +477,8 @@ class EncryptScreen(BaseScreen):
                     name_only, ext = os.path.splitext(filename)
                     save_path = os.path.join(save_folder, f"{name_only}_{timestamp}{ext}")
 
-                    # Simpan buffer ke file
-                    with open(save_path, 'wb') as f:
-                        f.write(self.encrypted_buffer)
+                    # Pindahkan file sementara ke folder tujuan
+                    shutil.move(self.encrypted_temp_path, save_path)
 
                     popup.dismiss()
                     self.show_message(f"File berhasil disimpan di:\n{save_path}")
@@ -266,17 +499,20 @@ class EncryptScreen(BaseScreen):
 
         sender_screen = self.manager.get_screen("sender")
 
-        if not hasattr(self, 'encrypted_buffer') or not self.encrypted_buffer:
+        temp_path = getattr(self, 'encrypted_temp_path', None)
+        if temp_path:
+            sender_screen.set_selected_file(temp_path)
+            # File sementara kini milik SenderScreen; reset_fields tidak menghapusnya
+            sender_screen.temp_path = temp_path
+            self.encrypted_temp_path = None
+        elif self.document_path and self.media_path and self.ids.secret_key.text:
+            # Belum dienkripsi: hasil embed langsung dikirim ke socket tanpa file sementara
+            temp_path = sender_screen.set_stream_job(self.document_path, self.media_path, self.ids.secret_key.text,
+                                                     lsb_mode=self.ids.lsb_mode.active)
+        else:
            self.show_message("Tidak Ada file stego untuk di transfer!")
            return
 
-        temp_filename = self.encrypted_filename if hasattr(self, 'encrypted_filename') else "temp_encrypted_stego.png"
-        temp_path = os.path.join(os.getcwd(), temp_filename)
-
-        with open(temp_path, 'wb') as f:
-            f.write(self.encrypted_buffer)
-
-        sender_screen.selected_file = temp_path
         sender_screen.temp_file_label = f"File: {os.path.basename(temp_path)}"
         self.manager.current = "sender"
 
@@ -294,11 +530,17 @@ class EncryptScreen(BaseScreen):
         encrypt_screen = App.get_running_app().root.get_screen('encrypt')
         Clock.schedule_once(lambda dt: encrypt_screen.reset_fields())
 
+    def reset_screen(self):
+        self.reset_fields()
+        return True
+
     def reset_fields(self):
         self.document_path = None
         self.media_path = None
         self.encrypted_file_path = None
-        self.encrypted_buffer = None
+        # Hasil yang tidak diunduh atau dikirim tidak ditinggalkan di disk
+        remove_temp_path(getattr(self, 'encrypted_temp_path', None))
+        self.encrypted_temp_path = None
         self.encrypted_filename = None
 
         if hasattr(self.ids, 'document_label'):
@@ -344,46 +586,34 @@ class DecryptScreen(BaseScreen):
             self.show_message("Pilih file stego terlebih dahulu!")
             return
 
-        try:
-            start_dec = time.perf_counter()
-            secret_key = self.ids.secret_key.text
-            if not secret_key:
-                self.show_message("Masukkan kunci dekripsi!")
-                return
-
-            secret_key = adjust_key_length(secret_key)
-
-            with open(self.selected_file, "rb") as f:
-                content = f.read()
-
-            eof_marker = b'E0F'
-            if eof_marker not in content:
-                self.show_message("File tidak valid atau bukan file hasil steganografi.")
-                return
-
-            marker_index = content.index(eof_marker)
-            iv = content[marker_index + len(eof_marker): marker_index + len(eof_marker) + AES.block_size]
-            encrypted_data = content[marker_index + len(eof_marker) + AES.block_size:]
-
-            cipher = AES.new(secret_key, AES.MODE_CBC, iv)
-            decrypted_padded = cipher.decrypt(encrypted_data)
-            decrypted = unpad(decrypted_padded, AES.block_size)
-
-            filename_len = int.from_bytes(decrypted[:2], 'big')
-            original_filename = decrypted[2:2 + filename_len].decode(errors='ignore')
-            file_content = decrypted[2 + filename_len:]
-
-            # Simpan ke buffer dan nama
-            self.decrypted_file_data = file_content
-            self.decrypted_file_name = original_filename
-            self.ids.decrypt_file_label.text = f"File: {original_filename}"
+        secret_key = self.ids.secret_key.text
+        if not secret_key:
+            self.show_message("Masukkan kunci dekripsi!")
+            return
 
-            self.show_message("File berhasil didekripsi dan siap diunduh.")
-            end_dec = time.perf_counter()
-            print(f"dekripsi file: selesai dalam {end_dec - start_dec:.3f} detik\n")
+        start_dec = time.perf_counter()
+        selected_file = self.selected_file
+
+        def work(progress, cancel):
+            return stego.extract(selected_file, secret_key,
+                                 workers=max(1, (os.cpu_count() or 1) - 1),
+                                 progress=progress, cancel=cancel)
+
+        def on_done(result, error):
+            if isinstance(error, stego.Cancelled):
+                self.show_message("Dekripsi dibatalkan.", duration=2)
+            elif isinstance(error, stego.StegoError):
+                self.show_message(str(error))
+            elif error:
+                self.show_message(f"Terjadi kesalahan: {str(error)}")
+            else:
+                # Simpan ke buffer dan nama
+                self.decrypted_file_name, self.decrypted_file_data = result
+                self.ids.decrypt_file_label.text = f"File: {self.decrypted_file_name}"
+                self.show_message("File berhasil didekripsi dan siap diunduh.")
+                print(f"dekripsi file: selesai dalam {time.perf_counter() - start_dec:.3f} detik\n")
 
-        except Exception as e:
-            self.show_message(f"Terjadi kesalahan: {str(e)}")
+        self.run_task("Sedang mendekripsi file...", work, on_done)
 
 
     def download_decrypted_file(self):
@@ -392,6 +622,8 @@ class DecryptScreen(BaseScreen):
             self.show_message("Tidak ada file yang dapat diunduh.")
             return
 
+        from kivy.uix.filechooser import FileChooserListView
+
         content = BoxLayout(orientation='vertical')
         file_chooser = FileChooserListView(dirselect=True)
 
@@ -424,6 +656,10 @@ class DecryptScreen(BaseScreen):
         content.add_widget(save_button)
         popup.open()
 
+    def reset_screen(self):
+        self.reset_halaman()
+        return True
+
     def reset_halaman(self):
         self.selected_file = None
         self.decrypted_file_path = None
@@ -445,11 +681,15 @@ class SenderScreen(BaseScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.selected_file = None
+        self.selected_files = []  # lebih dari satu file dikirim sebagai batch
+        self.stream_job = None  # (nama, write_to, perkiraan ukuran) untuk embed langsung ke socket
+        self.temp_path = None  # hasil enkripsi dari EncryptScreen yang dihapus setelah dipakai
         self.temp_file_label = ""
         self.popup = None  # Simpan referensi popup agar bisa ditutup di mana saja
+        self.progress_event = None
 
     def on_enter(self):
-        if self.selected_file and hasattr(self, 'temp_file_label'):
+        if (self.selected_file or self.stream_job) and hasattr(self, 'temp_file_label'):
             if "file_sender_label" in self.ids:
                 self.ids.file_sender_label.text = self.temp_file_label
             else:
@@ -459,31 +699,75 @@ class SenderScreen(BaseScreen):
     #     self.reset_transfer()
     
     def select_file(self):
-        """Buka FileChooserPopup hanya untuk file media (gambar/audio)."""
+        """Buka FileChooserPopup; beberapa file bisa dipilih sekaligus."""
         popup = FileChooserPopup(
         file_type="Dokumen/Media",
-            parent_screen=self
+            on_select_callback=self.set_selected_files,
+            multiselect=True
         )
         popup.open()
 
+    def set_stream_job(self, document_path, media_path, secret_key, lsb_mode=False):
+        """Menyiapkan pengiriman hasil embed yang ditulis langsung ke socket.
+
+        `lsb_mode` memakai lsb.embed_to seperti tombol Encrypt. Mengembalikan
+        nama file stego yang akan diterima receiver.
+        """
+        name = stego.stego_filename(media_path)
+        if lsb_mode:
+            # Media LSB tidak bertambah besar; ukurannya tetap ukuran media
+            size_hint = os.path.getsize(media_path)
+            embed_to = lsb.embed_to
+        else:
+            size_hint = os.path.getsize(document_path) + os.path.getsize(media_path)
+            embed_to = stego.embed_to
+
+        def write_to(out):
+            embed_to(document_path, media_path, secret_key, out)
+
+        self.discard_temp()
+        self.stream_job = (name, write_to, size_hint)
+        self.selected_file = None
+        self.selected_files = []
+        return name
+
+    def set_selected_files(self, file_paths):
+        if len(file_paths) <= 1:
+            self.set_selected_file(file_paths[0] if file_paths else None)
+            return
+
+        self.discard_temp()
+        self.selected_files = list(file_paths)
+        self.selected_file = file_paths[0]
+        self.stream_job = None
+        if "file_sender_label" in self.ids:
+            self.ids.file_sender_label.text = f"File: {os.path.basename(file_paths[0])} (+{len(file_paths) - 1} lainnya)"
+
     def set_selected_file(self, file_path, file_type=None):
         if not file_path:
             self.show_message("File tidak valid.")
             return
 
+        self.discard_temp()
         self.selected_file = file_path
+        self.selected_files = [file_path]
+        self.stream_job = None
         file_name = os.path.basename(file_path)
         if "file_sender_label" in self.ids:
             self.ids.file_sender_label.text = f"File: {file_name}"
         else:
             print("Label 'dekripsi_label' tidak ditemukan di .kv")
 
+    def discard_temp(self):
+        remove_temp_path(self.temp_path)
+        self.temp_path = None
+
     def send_file(self):
-        """Mengirim file ke receiver melalui TCP"""
+        """Mengirim file ke receiver melalui TCP di thread latar"""
         receiver_ip = self.ids.ip_input.text.strip()
-        port = 12345  # Port default
+        port = transfer.PORT
 
-        if not self.selected_file:
+        if not self.selected_file and not self.stream_job:
             self.show_message("Pilih file terlebih dahulu!")
             return
         
@@ -491,64 +775,98 @@ class SenderScreen(BaseScreen):
             self.show_message("Masukkan IP receiver!")
             return
 
+        paths = self.selected_files or [self.selected_file]
+        popup = Factory.TransferProgressPopup()
+        popup.ids.message_label.text = "Sedang mengirim file..."
+        popup.open()
+        # Thread jaringan hanya mengisi metrics; progress bar dibaca berkala di sini
+        metrics = transfer.TransferMetrics('send')
+        self.progress_event = Clock.schedule_interval(
+            lambda dt: self.update_progress(popup, metrics), 0.25)
+        threading.Thread(target=self.run_sender,
+                         args=(paths, receiver_ip, port, popup, self.stream_job, metrics,
+                               transfer_log_path()),
+                         daemon=True).start()
+
+    def update_progress(self, popup, metrics):
+        fraction = metrics.fraction
+        popup.ids.progress_bar.value = (fraction or 0) * 100
+        popup.ids.stats_label.text = format_metrics(metrics)
+
+    def run_sender(self, paths, receiver_ip, port, popup, stream_job=None, metrics=None,
+                   log_path=None):
+        """Dijalankan di thread latar; semua perubahan UI lewat Clock."""
+        if metrics is None:
+            metrics = transfer.TransferMetrics('send')
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as client_socket:
-                client_socket.settimeout(10)  # Batasi waktu koneksi
-                client_socket.connect((receiver_ip, port))
-                print("mengatur waktu koneksi")
-
-                # Kirim nama file terlebih dahulu
-                print("mengirim nama file")
-                filename = os.path.basename(self.selected_file)
-                client_socket.send(filename.encode())
-                filesize = str(os.path.getsize(self.selected_file))
-                #filesize = str(os.path.getsize("C:\\Users\\ACER\\Documents\\"+filename))
-                time.sleep(0.5)
-                print(f"Ukuran file dalam byte : {filesize}")
-                client_socket.send(filesize.encode())
-                
-                # Kirim isi file
-                print("Membaca dan mengirim isi file..")
-                popup_ref = [None]
-                Clock.schedule_once(lambda dt: popup_ref.__setitem__(0, self.show_temporary_message("Sedang mengirim file...")))
-                with open(self.selected_file, "rb") as file:
-                    data_kirim = file.read()
-                    client_socket.sendall(data_kirim)
-
-                Clock.schedule_once(lambda dt: popup_ref[0].dismiss() if popup_ref[0] else None)
-                Clock.schedule_once(lambda dt: self.show_message("Semua data berhasil dikirim."))
-                
-                # Menerima konfirmasi dari receiver
-                print("Konfirmasi dari penerima")
-                time.sleep(0.5)
-                confirmation = client_socket.recv(1024).decode()
-                if confirmation == "RECEIVED":
-                    self.show_message("File berhasil dikirim!")
-                    App.get_running_app().reload_screen('sender')
-                else:
-                    self.show_message("Gagal mengirim file!", duration=3)
-                
-                # Tutup socket
-                client_socket.close()
-                print("Socket di tutup!")
-                
-
+            if stream_job:
+                name, write_to, size_hint = stream_job
+                received = transfer.send_stream(write_to, name, receiver_ip, port,
+                                                size_hint=size_hint, metrics=metrics)
+                message = f"File berhasil dikirim! ({metrics.rate / 1e6:.1f} MB/s)"
+            elif len(paths) == 1:
+                received = transfer.send_file(paths[0], receiver_ip, port, metrics=metrics)
+                message = f"File berhasil dikirim! ({metrics.rate / 1e6:.1f} MB/s)"
+            else:
+                # Satu koneksi untuk seluruh batch
+                result = transfer.send_files(paths, receiver_ip, port, metrics=metrics)
+                received = not result.failed
+                message = (f"{len(result.succeeded)} file berhasil dikirim "
+                           f"({result.throughput / 1e6:.1f} MB/s)")
+                if result.failed:
+                    error = f"{len(result.failed)} dari {len(paths)} file gagal dikirim."
+                    if result.errors:
+                        error += f" Receiver: {next(iter(result.errors.values()))}"
+                    Clock.schedule_once(lambda dt: self.send_finished(popup, False, error))
+                    return
+        except transfer.ReceiverRefused as e:
+            # Pesan dari receiver, mis. kunci salah atau antrian penuh
+            error = f"Receiver menolak file: {e}"
+            Clock.schedule_once(lambda dt: self.send_finished(popup, False, error))
         except socket.timeout:
-            self.ids.status_label.text = "Koneksi timeout! Periksa IP penerima."
+            Clock.schedule_once(lambda dt: self.send_finished(popup, False, "Koneksi timeout! Periksa IP penerima."))
         except Exception as e:
-            self.ids.status_label.text = f"Error: {e}"
+            error = f"Error: {e}"
+            Clock.schedule_once(lambda dt: self.send_finished(popup, False, error))
+        else:
+            Clock.schedule_once(lambda dt: self.send_finished(popup, received, message=message))
+        finally:
+            if log_path:
+                try:
+                    metrics.write_log(log_path)
+                except OSError as e:
+                    print("Log transfer gagal ditulis:", e)
+
+    def send_finished(self, popup, received, error=None, message="File berhasil dikirim!"):
+        if self.progress_event:
+            self.progress_event.cancel()
+            self.progress_event = None
+        popup.dismiss()
+        if error:
+            self.ids.status_label.text = error
+        elif received:
+            self.show_message(message)
+            App.get_running_app().reload_screen('sender')
+        else:
+            self.show_message("Gagal mengirim file!", duration=3)
 
-    # def reset_transfer(self):
-    #     self.selected_file = None
+    def reset_screen(self):
+        self.reset_transfer()
+        return True
 
-    #     if "file_sender_label" in self.ids:
-    #         self.ids.file_sender_label.text = "File: Belum dipilih"
+    def reset_transfer(self):
+        """Mengosongkan pilihan file; IP receiver dipertahankan untuk pengiriman berikutnya."""
+        self.discard_temp()
+        self.selected_file = None
+        self.selected_files = []
+        self.stream_job = None
+        self.temp_file_label = ""
 
-    #     if "ip_input" in self.ids:
-    #         self.ids.ip_input.text = ""
+        if "file_sender_label" in self.ids:
+            self.ids.file_sender_label.text = "File: Belum dipilih"
 
-    #     if "status_label" in self.ids:
-    #         self.ids.status_label.text = ""
+        if "status_label" in self.ids:
+            self.ids.status_label.text = ""
 
 
 class ReceiverScreen(BaseScreen):
@@ -557,16 +875,18 @@ class ReceiverScreen(BaseScreen):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.file_data = None
-        self.nama_file = None
+        self.service = None
+        self.current_file = None  # ReceivedFile yang sedang ditampilkan/disimpan
+        self.progress_event = None
 
     def on_enter(self):
         """Dipanggil saat masuk ke halaman, IP disembunyikan"""
         self.hide_ip()
 
     def on_leave(self):
-        """Dipanggil saat keluar dari halaman, IP disembunyikan"""
+        """Dipanggil saat keluar dari halaman: IP disembunyikan, server dihentikan"""
         self.hide_ip()
+        self.stop_server()
 
     def get_ip_address(self):
         """Mendapatkan alamat IP perangkat"""
@@ -589,64 +909,82 @@ class ReceiverScreen(BaseScreen):
 
 
     def start_server(self):
-        """Membuka server untuk menerima koneksi"""
-        print("membuka server ")
-        server_thread = threading.Thread(target=self.run_server, daemon=True)
-        server_thread.start()
-
-    def run_server(self):
-        """Membuka koneksi dan menerima data"""
+        """Membuka server yang melayani banyak sender sampai halaman ditinggalkan"""
+        if self.service and self.service.running:
+            self.show_message("Koneksi sudah terbuka.", duration=1)
+            return
+        if self.service is None:
+            self.service = transfer.ReceiverService(
+                temp_dir=received_dir(),
+                on_connect=lambda addr: Clock.schedule_once(lambda dt: self.show_message(f"Koneksi diterima dari {addr}", duration=1)),
+                on_received=lambda item: Clock.schedule_once(lambda dt: self.update_received_label()),
+                on_error=lambda addr, e: Clock.schedule_once(lambda dt: self.show_message(f"Gagal menerima dari {addr[0]}: {e}", duration=3)),
+                log_path=transfer_log_path(),
+            )
+        # Kunci dibaca setiap kali koneksi dibuka; kosong berarti file disimpan apa adanya
+        self.service.extract_key = self.ids.extract_key.text or None
         try:
-            print("Menunggu koneksi masuk...")
-            server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            server_socket.bind(("0.0.0.0", 12345))  # Menerima dari semua alamat pada port 12345
-            server_socket.listen(1)
-        
-
-            conn, addr = server_socket.accept()
-            
-            Clock.schedule_once(lambda dt: self.show_message(f"Koneksi diterima dari {addr}", duration=1))
-
-            # Menerima data (bisa diubah sesuai format yang dikirimkan oleh sender)
-            with conn:
-                # Menerima nama file
-                self.nama_file = conn.recv(1024).decode()
-                print("Nama file diterima : ", self.nama_file)
-                # Menerima ukuran file
-                ukuran_file = conn.recv(1024).decode()
-                print("Ukuran file diterima : ", ukuran_file)
-                # Menerima isi file
-                popup_ref = [None]
-                Clock.schedule_once(lambda dt: popup_ref.__setitem__(0, self.show_temporary_message("Sedang menerima file...")))
-
-                data_diterima = 0
-                file_data = b''
-                while data_diterima < int(ukuran_file):
-                    data = conn.recv(int(ukuran_file))
-                    if not data:
-                        break
-                    file_data += data
-                    data_diterima += len(data)
-                    print(f"Data diterima: {len(file_data)} bytes")
-
-                Clock.schedule_once(lambda dt: popup_ref[0].dismiss() if popup_ref[0] else None)
-                print("Mengirim sinyal RECEIVED..")
-                conn.send("RECEIVED".encode())
-
-                self.file_data = file_data
-                # self.receiver_file_path = f"File diterima: {self.nama_file}"
-                Clock.schedule_once(lambda dt: setattr(self, 'receiver_file_path', f"File diterima: {self.nama_file}"))
-
-            server_socket.close()
+            self.service.start()
+        except OSError as e:
+            self.show_message(f"errornya:{e}")
+            return
+        print("Menunggu koneksi masuk...")
+        self.update_received_label()
+        if self.progress_event is None:
+            self.progress_event = Clock.schedule_interval(self.update_progress, 0.25)
+
+    def stop_server(self):
+        if self.progress_event:
+            self.progress_event.cancel()
+            self.progress_event = None
+        if self.service:
+            self.service.stop()
             print("Socket telah ditutup..")
-        except Exception as e:
-            self.show_message(f"errornya:{e}") 
+
+    def update_progress(self, dt):
+        """Menampilkan progres file yang sedang diterima (dipanggil Clock)."""
+        transfers = self.service.transfers() if self.service else []
+        if not transfers:
+            self.ids.receive_progress.value = 0
+            self.ids.receive_stats.text = ""
+            return
+        metrics = transfers[0]
+        self.ids.receive_progress.value = (metrics.fraction or 0) * 100
+        text = f"{metrics.name or 'File'}: {format_metrics(metrics)}"
+        if len(transfers) > 1:
+            text += f" (+{len(transfers) - 1} koneksi)"
+        self.ids.receive_stats.text = text
+
+    def update_received_label(self):
+        if self.current_file is None and self.service:
+            self.current_file = self.service.take()
+        pending = self.service.received.qsize() if self.service else 0
+        if self.current_file:
+            label = "Dokumen diekstrak" if self.current_file.extracted else "File diterima"
+            text = f"{label}: {self.current_file.name}"
+            if pending:
+                text += f" (+{pending} antre)"
+        elif self.service and self.service.running:
+            text = "Menunggu file masuk..."
+        else:
+            text = ""
+        self.receiver_file_path = text
+
+    def discard_received_file(self):
+        """Menghapus file sementara hasil terima yang belum disimpan."""
+        if self.current_file and os.path.exists(self.current_file.path):
+            os.remove(self.current_file.path)
+        self.current_file = None
+        if self.service:
+            self.service.discard_pending()
 
     def download_File_Diterima(self):
-        if not self.file_data:
+        if not self.current_file:
             self.show_message("Belum ada file yang diterima!")
             return
 
+        from kivy.uix.filechooser import FileChooserListView
+
         content = BoxLayout(orientation='vertical')
         default_folder = join(expanduser("~"), "Documents")
         filechooser = FileChooserListView(path=default_folder, dirselect=True)
@@ -654,13 +992,17 @@ class ReceiverScreen(BaseScreen):
 
         def save_file(instance):
             folder_path = filechooser.path
-            full_path = os.path.join(folder_path, self.nama_file)
-            with open(full_path, "wb") as f:
-                f.write(self.file_data)
-            self.receiver_file_path = f"File disimpan: {self.nama_file}"
+            received = self.current_file
+            full_path = os.path.join(folder_path, received.name)
+            # Rename atomik bila satu filesystem, selain itu disalin
+            shutil.move(received.path, full_path)
+            self.current_file = None
             popup.dismiss()
             self.show_message("Sukses", f"File berhasil disimpan di:\n{full_path}")
-            App.get_running_app().reload_screen('receiver')
+            # Server tetap berjalan; tampilkan file berikutnya di antrian
+            self.update_received_label()
+            if not self.current_file:
+                self.receiver_file_path = f"File disimpan: {received.name}"
 
         content.add_widget(filechooser)
         content.add_widget(button_save)
@@ -671,45 +1013,87 @@ class ReceiverScreen(BaseScreen):
         button_save.bind(on_press=save_file)
         popup.open()
 
+class LazyScreenManager(ScreenManager):
+    """ScreenManager yang membuat screen saat pertama kali dibutuhkan.
+
+    `get_screen` (dipakai juga oleh setter `current`) membuat screen yang
+    belum ada dari `factories`; waktu pembuatannya dicatat di startup_timer.
+    """
+
+    def __init__(self, factories, **kwargs):
+        self.factories = factories
+        super().__init__(**kwargs)
+
+    def is_built(self, name):
+        return super().has_screen(name)
+
+    def get_screen(self, name):
+        if not self.is_built(name) and name in self.factories:
+            start = time.perf_counter()
+            self.add_widget(self.factories[name](name=name))
+            startup_timer.screen_built(name, time.perf_counter() - start)
+        return super().get_screen(name)
+
+
+SCREEN_CLASSES = {
+    'splash': SplashScreen,
+    'main': MainScreen,
+    'instruction': InstructionScreen,
+    'encrypt': EncryptScreen,
+    'decrypt': DecryptScreen,
+    'transfer': TransferScreen,
+    'sender': SenderScreen,
+    'receiver': ReceiverScreen,
+}
+
+
 class HIDEasyApp(App):
     screen_ratio = NumericProperty(0)
+    # False: semua screen dibuat di build() seperti sebelumnya (untuk perbandingan)
+    lazy_screens = os.environ.get('HIDEASY_EAGER_SCREENS') != '1'
 
     def build(self):
         Builder.load_file("custom_widgets.kv")
         Builder.load_file("myapp.kv")  
-        sm = ScreenManager()
-        sm.add_widget(SplashScreen(name='splash'))
-        sm.add_widget(MainScreen(name='main'))
-        sm.add_widget(InstructionScreen(name='instruction'))
-        sm.add_widget(EncryptScreen(name='encrypt'))
-        sm.add_widget(DecryptScreen(name='decrypt'))
-        sm.add_widget(TransferScreen(name='transfer'))
-        sm.add_widget(SenderScreen(name='sender'))
-        sm.add_widget(ReceiverScreen(name='receiver'))
+        startup_timer.mark('kv_loaded')
+        sm = LazyScreenManager(SCREEN_CLASSES)
+        # Hanya splash yang dibuat sekarang; sisanya saat pertama kali dibuka
+        names = SCREEN_CLASSES if not self.lazy_screens else ['splash']
+        for name in names:
+            sm.get_screen(name)
+        startup_timer.mark('build')
         return sm
     
-    def reload_screen(self, screen_name):
+    def on_stop(self):
+        # Hentikan server penerima dan hapus file sementara yang tidak disimpan
+        if not self.root.is_built('receiver'):
+            return
+        receiver = self.root.get_screen('receiver')
+        receiver.stop_server()
+        receiver.discard_received_file()
+
+    def reload_screen(self, screen_name, rebuild=False):
+        """Menampilkan screen dalam keadaan bersih setelah satu operasi selesai.
+
+        Screen yang punya `reset_screen` dipakai ulang dan hanya state-nya
+        yang dikosongkan; widget dibangun ulang dari kv hanya bila screen
+        tidak bisa di-reset atau `rebuild` diminta.
+        """
         sm = self.root
+        if screen_name not in SCREEN_CLASSES:
+            print(f"[!] Screen '{screen_name}' tidak ditemukan dalam mapping.")
+            return
+
+        start = time.perf_counter()
         existing_screen = sm.get_screen(screen_name)
-        
-        screen_classes = {
-            'encrypt': EncryptScreen,
-            'decrypt': DecryptScreen,
-            'sender': SenderScreen,
-            'receiver': ReceiverScreen,
-            'transfer': TransferScreen,
-            'main': MainScreen,
-            'instruction': InstructionScreen,
-            'splash': SplashScreen
-        }
-
-        if screen_name in screen_classes:
-            screen_class = screen_classes[screen_name]
+        if rebuild or not existing_screen.reset_screen():
             sm.remove_widget(existing_screen)
-            sm.add_widget(screen_class(name=screen_name))
-            sm.current = screen_name
+            sm.add_widget(SCREEN_CLASSES[screen_name](name=screen_name))
+            mode = "dibangun ulang"
         else:
-            print(f"[!] Screen '{screen_name}' tidak ditemukan dalam mapping.")
+            mode = "di-reset"
+        sm.current = screen_name
+        print(f"Screen {screen_name} {mode} dalam {(time.perf_counter() - start) * 1000:.1f} ms")
 
 
 if __name__ == '__main__':
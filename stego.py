@@ -0,0 +1,892 @@
+"""Mesin steganografi HIDEasy tanpa ketergantungan pada Kivy.
+
+Modul ini berisi logika penyisipan (embed) dan ekstraksi (extract) dokumen
+terenkripsi AES ke dalam file media. Semua fungsi menerima path, bytes,
+atau file object sehingga bisa dipakai dari layar Kivy, worker process,
+maupun skrip batch/benchmark.
+
+Format file stego:
+    legacy (0): media + b'E0F' + iv + ciphertext
+    trailer (1): media + b'E0F' + versi + iv + ciphertext + trailer
+    kdf (2): media + b'E0F' + versi + header + ciphertext + trailer
+    gcm (3): media + b'E0F' + versi + header + ciphertext + tag + trailer
+    segmen (4): media + b'E0F' + versi + header + (ciphertext + tag)... + trailer
+
+Header versi 2 ke atas berupa panjang header (2 byte) diikuti field
+tag-panjang-nilai (parameter KDF, salt, iv). Kunci AES-256 diturunkan dengan
+scrypt atau PBKDF2; versi 0 dan 1 tetap memakai `adjust_key_length`.
+Versi 0-2 memakai AES-CBC. Versi 3 memakai AES-GCM dengan header sebagai
+associated data dan menyimpan nilai cek kunci, sehingga kunci salah ditolak
+sebelum payload didekripsi dan file yang diubah terdeteksi lewat tag.
+
+Versi 4 memecah plaintext menjadi segmen berukuran tetap yang masing-masing
+dienkripsi AES-GCM dengan nonce = prefix acak + nomor segmen, dan associated
+data = header + penanda segmen terakhir. Urutan, pemotongan, maupun
+perubahan segmen terdeteksi, dan segmen bisa diproses paralel di thread pool
+(PyCryptodome melepas GIL selama enkripsi).
+
+Sebelum dienkripsi, isi dokumen dapat dikompresi zlib atau lzma. Codec yang
+dipakai dicatat di header; mode 'auto' mengambil sampel dokumen dan
+melewati kompresi bila datanya sudah terkompresi (jpg, docx, zip, ...).
+
+Trailer berukuran tetap di akhir file mencatat offset dan panjang payload
+(mulai dari b'E0F'), sehingga ekstraksi cukup membaca ekor file lalu seek
+langsung ke payload tanpa memindai seluruh media.
+
+File pada disk dipetakan dengan mmap; media dan ciphertext diproses lewat
+memoryview sehingga tidak pernah disalin utuh ke memori Python.
+
+embed_to dan extract menerima `progress(selesai, total)` dan `cancel` (mis.
+threading.Event). Keduanya diperiksa di antara segmen sehingga pemanggil di
+thread latar bisa menampilkan progres dan membatalkan proses; pembatalan
+dilempar sebagai Cancelled.
+
+Mode LSB (modul lsb) menyimpan payload format 4 yang sama di bit terendah
+piksel PNG atau sampel WAV, bukan di akhir file. extract mengenalinya
+sendiri: media PNG/WAV tanpa trailer diperiksa bit terendahnya sebelum
+jatuh ke pencarian b'E0F' format lama.
+
+StreamExtractor mengekstrak format 4 dari aliran byte (mis. socket) tanpa
+menyimpan file stego: header dikenali lewat cek kunci, lalu setiap segmen
+didekripsi dan ditulis begitu tag-nya terverifikasi.
+"""
+from Crypto.Cipher import AES
+from Crypto.Hash import HMAC, SHA256
+from Crypto.Protocol.KDF import PBKDF2, scrypt
+from Crypto.Util.Padding import pad
+from Crypto.Random import get_random_bytes
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO, UnsupportedOperation
+from itertools import chain
+import hmac
+import lzma
+import mmap
+import struct
+import os
+import zlib
+
+
+MARKER = b'E0F'
+CHUNK_SIZE = 1024 * 1024  # Ukuran segmen enkripsi
+
+FORMAT_LEGACY = 0
+FORMAT_TRAILER = 1
+FORMAT_KDF = 2
+FORMAT_GCM = 3
+FORMAT_SEGMENTED = 4
+_TRAILER_FORMATS = (FORMAT_TRAILER, FORMAT_KDF, FORMAT_GCM, FORMAT_SEGMENTED)
+
+TRAILER_MAGIC = b'HIDEASY!'
+_TRAILER = struct.Struct('>QQ8s')  # offset payload, panjang payload, magic
+
+_HEADER_LEN = struct.Struct('>H')
+_FIELD = struct.Struct('>BB')  # tag, panjang nilai
+FIELD_KDF = 1
+FIELD_SALT = 2
+FIELD_IV = 3
+FIELD_CHECK = 4
+FIELD_SEGMENT = 5
+FIELD_CODEC = 6
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_LZMA = 2
+COMPRESSION_CODECS = {'none': CODEC_NONE, 'zlib': CODEC_ZLIB, 'lzma': CODEC_LZMA}
+_PROBE_SIZE = 64 * 1024
+_PROBE_RATIO = 0.9  # sampel harus menyusut minimal 10% agar kompresi dipakai
+
+_SEGMENT = struct.Struct('>I')  # ukuran segmen / nomor segmen di nonce
+
+KDF_SCRYPT = 1
+KDF_PBKDF2 = 2
+_KDF_PARAMS = struct.Struct('>BIBB')  # jenis, cost, r, p
+
+KEY_SIZE = 32  # AES-256 untuk format baru
+SALT_SIZE = 16
+NONCE_SIZE = 12
+NONCE_PREFIX_SIZE = NONCE_SIZE - _SEGMENT.size
+TAG_SIZE = 16
+CHECK_SIZE = 8
+_FIELDS_SIZE = sum(_FIELD.size + size for size in
+                   (_KDF_PARAMS.size, SALT_SIZE, NONCE_PREFIX_SIZE, CHECK_SIZE, _SEGMENT.size, 1))
+
+_LSB_SIGNATURES = (b'\x89PNG', b'RIFF')  # media yang mungkin berisi payload LSB
+# (jenis, cost, r, p); cost scrypt berupa log2(N), cost PBKDF2 berupa iterasi
+SCRYPT_PARAMS = (KDF_SCRYPT, 14, 8, 1)
+PBKDF2_PARAMS = (KDF_PBKDF2, 200000, 0, 0)
+DEFAULT_KDF = SCRYPT_PARAMS
+# Batas parameter KDF dari header, dekat nilai default, supaya file dari
+# pengirim tak dikenal tidak bisa menghabiskan memori/CPU (mis. receiver Android)
+_MAX_SCRYPT_COST = 16
+_MAX_SCRYPT_WORK = 1 << 19  # N * r * p; memori scrypt 128 * N * r = 64 MiB
+_MAX_PBKDF2_COST = 1000000
+_MAX_KEY_CANDIDATES = 8  # KDF yang boleh dijalankan StreamExtractor per aliran
+
+
+class StegoError(Exception):
+    """Kesalahan format atau isi file stego."""
+
+
+class Cancelled(StegoError):
+    """Proses dihentikan karena `cancel` diaktifkan pemanggil."""
+
+
+class _Progress:
+    """Penghitung progres yang juga memeriksa permintaan batal."""
+
+    def __init__(self, callback, cancel, total):
+        self.callback = callback
+        self.cancel = cancel
+        self.total = total
+        self.done = 0
+
+    def advance(self, count=0):
+        if self.cancel is not None and self.cancel.is_set():
+            raise Cancelled("Proses dibatalkan.")
+        if count and self.callback:
+            self.done += count
+            self.callback(self.done, self.total)
+
+    def counted(self, chunks):
+        for chunk in chunks:
+            self.advance(len(chunk))
+            yield chunk
+
+
+def adjust_key_length(user_key: str, target_length: int = 24) -> bytes:
+    """Menyesuaikan panjang kunci untuk AES 192-bit."""
+    key_bytes = user_key.encode('utf-8')
+
+    if len(key_bytes) < target_length:
+        padded_key = pad(key_bytes, target_length)[:target_length]
+    else:
+        padded_key = key_bytes[:target_length]
+
+    return padded_key
+
+
+DerivedKey = namedtuple('DerivedKey', 'params salt key')
+DerivedKey.__doc__ = """Kunci hasil KDF beserta parameter dan salt-nya.
+
+Buat sekali dengan `derive_key` lalu pakai untuk banyak `embed_to` agar
+biaya KDF tidak dibayar per file.
+"""
+
+
+@lru_cache(maxsize=32)
+def _derive(passphrase: str, salt: bytes, params: tuple) -> bytes:
+    """Menjalankan KDF; hasilnya di-cache per (passphrase, salt, parameter)."""
+    kdf, cost, r, p = params
+    secret = passphrase.encode('utf-8')
+    try:
+        if kdf == KDF_SCRYPT:
+            return scrypt(secret, salt, KEY_SIZE, N=1 << cost, r=r, p=p)
+        if kdf == KDF_PBKDF2:
+            return PBKDF2(secret, salt, KEY_SIZE, count=cost, hmac_hash_module=SHA256)
+    except (ValueError, ZeroDivisionError) as e:
+        raise StegoError(f"Parameter KDF tidak valid: {e}")
+    raise StegoError("Jenis KDF tidak dikenal.")
+
+
+def _check_kdf(params):
+    """Menolak parameter KDF dari header yang tidak dikenal atau terlalu berat."""
+    kdf, cost, r, p = params
+    if kdf == KDF_SCRYPT:
+        valid = 1 <= cost <= _MAX_SCRYPT_COST and r >= 1 and p >= 1 \
+            and (1 << cost) * r * p <= _MAX_SCRYPT_WORK
+    elif kdf == KDF_PBKDF2:
+        valid = 1 <= cost <= _MAX_PBKDF2_COST and r == p == 0
+    else:
+        valid = False
+    if not valid:
+        raise StegoError("Parameter KDF tidak didukung.")
+
+
+def _key_check(key: bytes) -> bytes:
+    """Nilai cek kunci pendek yang disimpan di header format GCM."""
+    return HMAC.new(key, b'HIDEasy key check', SHA256).digest()[:CHECK_SIZE]
+
+
+def derive_key(passphrase: str, params: tuple = DEFAULT_KDF, salt: bytes = None) -> DerivedKey:
+    """Menurunkan kunci AES dari passphrase dengan salt acak (atau yang diberikan).
+
+    Parameter di atas batas yang diterima saat ekstraksi ditolak, agar tidak
+    ada file yang tidak bisa dibuka lagi.
+    """
+    _check_kdf(tuple(params))
+    if salt is None:
+        salt = get_random_bytes(SALT_SIZE)
+    return DerivedKey(tuple(params), salt, _derive(passphrase, salt, tuple(params)))
+
+
+@contextmanager
+def _open_source(source):
+    """Membuka sumber data berupa path, bytes, atau file object untuk dibaca."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield f
+    else:
+        yield source
+
+
+@contextmanager
+def _open_target(target):
+    """Membuka tujuan berupa path atau file object untuk ditulis."""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'wb') as f:
+            yield f
+    else:
+        yield target
+
+
+@contextmanager
+def _mapped(source):
+    """Memberikan isi sumber sebagai objek buffer tanpa membacanya ke memori.
+
+    Path dan file pada disk dipetakan dengan mmap (read-only), bytes dipakai
+    langsung. Objek yang dihasilkan mendukung `find` dan `memoryview`.
+    File object tanpa fileno (mis. BytesIO) terpaksa dibaca seluruhnya.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        yield source
+        return
+    if isinstance(source, memoryview):
+        yield source.tobytes()  # memoryview tidak punya `find`
+        return
+
+    with _open_source(source) as f:
+        try:
+            fileno = f.fileno()
+        except (AttributeError, OSError, UnsupportedOperation):
+            yield f.read()
+            return
+
+        if os.fstat(fileno).st_size == 0:
+            yield b''
+            return
+        mapping = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapping
+        finally:
+            try:
+                mapping.close()
+            except BufferError:
+                # Masih ada view yang hidup (mis. saat exception); mapping
+                # akan dilepas sendiri ketika view terakhir dibuang.
+                pass
+
+
+def _source_name(source):
+    """Nama file dari sumber, jika sumbernya berupa path atau file bernama."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    name = getattr(source, 'name', None)
+    if isinstance(name, str):
+        return os.path.basename(name)
+    return None
+
+
+def stego_filename(carrier_path: str) -> str:
+    """Nama file keluaran stego, contoh: foto.png -> foto_stego.png."""
+    name_only, ext = os.path.splitext(os.path.basename(carrier_path))
+    return name_only + "_stego" + ext
+
+
+def _filename_prefix(document, filename):
+    """Header plaintext: panjang nama file (2 byte) + nama file."""
+    if filename is None:
+        filename = _source_name(document)
+    if not filename:
+        raise StegoError("Nama file dokumen tidak diketahui.")
+
+    original_filename = filename.encode()
+    if len(original_filename) > 65535:
+        raise StegoError("Nama file terlalu panjang untuk dienkripsi.")
+    return len(original_filename).to_bytes(2, 'big') + original_filename
+
+
+def _chunks(view, chunk_size):
+    """Memotong memoryview menjadi slice tanpa menyalin datanya."""
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def _plain_segments(prefix, doc, segment_size):
+    """Memecah prefix + dokumen menjadi segmen plaintext berukuran tetap.
+
+    Hanya segmen yang bersinggungan dengan prefix yang disalin; sisanya
+    berupa slice memoryview dokumen.
+    """
+    total = len(prefix) + len(doc)
+    count = max(1, -(-total // segment_size))
+    for index in range(count):
+        start = index * segment_size
+        end = min(start + segment_size, total)
+        if start >= len(prefix):
+            segment = doc[start - len(prefix):end - len(prefix)]
+        else:
+            segment = prefix[start:end] + bytes(doc[:max(0, end - len(prefix))])
+        yield index, index == count - 1, segment
+
+
+def _resegment(chunks, segment_size):
+    """Mengumpulkan potongan berukuran acak menjadi segmen berukuran tetap."""
+    buffer = bytearray()
+    index = 0
+    for chunk in chunks:
+        buffer += chunk
+        # Segmen hanya dilepas bila pasti masih ada data sesudahnya,
+        # sehingga sisa buffer di akhir selalu menjadi segmen terakhir.
+        while len(buffer) > segment_size:
+            yield index, False, bytes(buffer[:segment_size])
+            del buffer[:segment_size]
+            index += 1
+    yield index, True, bytes(buffer)
+
+
+def choose_codec(document) -> int:
+    """Memilih codec lewat probe: sampel awal dan tengah dikompresi cepat."""
+    with _mapped(document) as doc:
+        middle = len(doc) // 2
+        sample = bytes(doc[:_PROBE_SIZE]) + bytes(doc[middle:middle + _PROBE_SIZE])
+    if not sample:
+        return CODEC_NONE
+    ratio = len(zlib.compress(sample, 1)) / len(sample)
+    return CODEC_ZLIB if ratio < _PROBE_RATIO else CODEC_NONE
+
+
+def _compressed(chunks, codec):
+    compressor = zlib.compressobj(6) if codec == CODEC_ZLIB else lzma.LZMACompressor(preset=1)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _decompress(data, codec):
+    try:
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(data)
+        if codec == CODEC_LZMA:
+            return lzma.decompress(data)
+    except (zlib.error, lzma.LZMAError):
+        raise StegoError("Data terkompresi rusak.")
+    raise StegoError("Codec kompresi tidak dikenal.")
+
+
+def _segment_cipher(aes_key, nonce_prefix, header, index, final):
+    cipher = AES.new(aes_key, AES.MODE_GCM, nonce=nonce_prefix + _SEGMENT.pack(index))
+    cipher.update(header + (b'\x01' if final else b'\x00'))
+    return cipher
+
+
+def _workers(workers):
+    return (os.cpu_count() or 1) if workers is None else max(1, workers)
+
+
+def _parallel(func, items, workers):
+    """Menjalankan func(*item) di thread pool; hasil dikembalikan berurutan.
+
+    Jumlah tugas yang sedang berjalan dibatasi agar memori tetap terkendali
+    walaupun penulis hasil lebih lambat dari enkripsi.
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(*item)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, *item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _pack_fields(fields):
+    return b''.join(_FIELD.pack(tag, len(value)) + value for tag, value in fields)
+
+
+def _unpack_fields(data):
+    fields = {}
+    pos = 0
+    while pos < len(data):
+        if pos + _FIELD.size > len(data):
+            raise StegoError("Header file stego rusak.")
+        tag, size = _FIELD.unpack_from(data, pos)
+        pos += _FIELD.size
+        fields[tag] = bytes(data[pos:pos + size])
+        pos += size
+    if pos != len(data):
+        raise StegoError("Header file stego rusak.")
+    return fields
+
+
+def embed_to(document, carrier, key, output, filename: str = None,
+             chunk_size: int = CHUNK_SIZE, workers: int = None,
+             compression: str = 'auto', progress=None, cancel=None):
+    """Menyisipkan dokumen ke media dan menulis hasilnya langsung ke `output`.
+
+    `key` berupa passphrase atau `DerivedKey` dari `derive_key`. Media
+    disalin apa adanya, lalu ditulis b'E0F' + versi + header, kemudian
+    dokumen dienkripsi per segmen `chunk_size` byte di `workers` thread
+    (default: jumlah CPU) sehingga pemakaian memori tetap datar berapa pun
+    ukuran filenya. Terakhir ditulis trailer berisi offset dan panjang
+    payload. `compression` berupa 'auto', 'zlib', 'lzma', atau 'none'.
+    `progress(selesai, total)` dihitung dalam byte media + dokumen yang
+    sudah diproses. Mengembalikan jumlah byte yang ditulis.
+    """
+    prefix = _filename_prefix(document, filename)
+    if compression == 'auto':
+        codec = choose_codec(document)
+    elif compression in COMPRESSION_CODECS:
+        codec = COMPRESSION_CODECS[compression]
+    else:
+        raise StegoError(f"Kompresi '{compression}' tidak dikenal.")
+    if not isinstance(key, DerivedKey):
+        key = derive_key(key)
+    nonce_prefix = get_random_bytes(NONCE_PREFIX_SIZE)
+    fields = _pack_fields([
+        (FIELD_KDF, _KDF_PARAMS.pack(*key.params)),
+        (FIELD_SALT, key.salt),
+        (FIELD_IV, nonce_prefix),
+        (FIELD_CHECK, _key_check(key.key)),
+        (FIELD_SEGMENT, _SEGMENT.pack(chunk_size)),
+        (FIELD_CODEC, bytes([codec])),
+    ])
+    header = MARKER + bytes([FORMAT_SEGMENTED]) + _HEADER_LEN.pack(len(fields)) + fields
+
+    def seal(index, final, segment):
+        cipher = _segment_cipher(key.key, nonce_prefix, header, index, final)
+        return cipher.encrypt_and_digest(segment)
+
+    with _mapped(document) as doc, _mapped(carrier) as media, \
+            _open_target(output) as out:
+        offset = len(media)
+        tracker = _Progress(progress, cancel, len(media) + len(doc))
+        for chunk in tracker.counted(_chunks(memoryview(media), chunk_size)):
+            out.write(chunk)
+
+        out.write(header)
+        length = len(header)
+
+        if codec == CODEC_NONE:
+            tracker.total += len(prefix)
+            segments = _plain_segments(prefix, memoryview(doc), chunk_size)
+        else:
+            # Hanya isi dokumen yang dikompresi; prefix nama file tetap mentah.
+            # Progres dihitung dari dokumen yang sudah masuk ke compressor.
+            chunks = tracker.counted(_chunks(memoryview(doc), chunk_size))
+            segments = _resegment(chain([prefix], _compressed(chunks, codec)), chunk_size)
+        for encrypted, tag in _parallel(seal, segments, _workers(workers)):
+            out.write(encrypted)
+            out.write(tag)
+            length += len(encrypted) + len(tag)
+            tracker.advance(len(encrypted) if codec == CODEC_NONE else 0)
+
+        out.write(_TRAILER.pack(offset, length, TRAILER_MAGIC))
+        return offset + length + _TRAILER.size
+
+
+def payload_size(document, filename: str = None, chunk_size: int = CHUNK_SIZE) -> int:
+    """Ukuran payload embed_to (dari b'E0F' sampai trailer) tanpa kompresi.
+
+    Dihitung dari ukuran dokumen saja, tanpa enkripsi; dengan kompresi
+    payload sebenarnya bisa lebih kecil.
+    """
+    with _mapped(document) as doc:
+        plain = len(_filename_prefix(document, filename)) + len(doc)
+    segments = max(1, -(-plain // chunk_size))
+    return len(MARKER) + 1 + _HEADER_LEN.size + _FIELDS_SIZE + plain + \
+        segments * TAG_SIZE + _TRAILER.size
+
+
+def embed(document, carrier, key, filename: str = None, **options) -> bytes:
+    """Mengenkripsi dokumen dan menyisipkannya di akhir media.
+
+    Mengembalikan isi file stego lengkap (lihat format di docstring modul).
+    `filename` dipakai bila nama dokumen tidak bisa diambil dari sumbernya;
+    opsi lain diteruskan ke `embed_to`.
+    """
+    buffer = BytesIO()
+    embed_to(document, carrier, key, buffer, filename=filename, **options)
+    return buffer.getvalue()
+
+
+def _locate_trailer(data):
+    """(versi, offset, panjang) dari trailer yang valid, atau None."""
+    size = len(data)
+    if size >= _TRAILER.size:
+        offset, length, magic = _TRAILER.unpack(data[size - _TRAILER.size:])
+        if magic == TRAILER_MAGIC and offset + length + _TRAILER.size == size:
+            head = data[offset:offset + len(MARKER) + 1]
+            if head[:len(MARKER)] == MARKER and head[len(MARKER):] and \
+                    head[len(MARKER)] in _TRAILER_FORMATS:
+                return head[len(MARKER)], offset, length
+    return None
+
+
+def _locate(data):
+    """Versi, offset, dan panjang payload di dalam buffer stego."""
+    located = _locate_trailer(data)
+    if located:
+        return located
+
+    offset = data.find(MARKER)
+    if offset < 0:
+        raise StegoError("File tidak valid atau bukan file hasil steganografi.")
+    return FORMAT_LEGACY, offset, len(data) - offset
+
+
+def locate(stego):
+    """Menentukan format dan letak payload di dalam file stego.
+
+    Mengembalikan tuple (versi, offset, panjang) payload yang diawali b'E0F'.
+    File bertrailer cukup dibaca ekornya; file legacy dipindai dari awal.
+    """
+    with _mapped(stego) as data:
+        return _locate(data)
+
+
+def _unpad_in_place(buffer: bytearray):
+    """Membuang padding PKCS#7 tanpa menyalin buffer."""
+    pad_len = buffer[-1] if buffer else 0
+    if not 1 <= pad_len <= AES.block_size or \
+            buffer[-pad_len:] != bytes([pad_len]) * pad_len:
+        raise StegoError("Kunci salah atau file rusak.")
+    del buffer[-pad_len:]
+
+
+def _read_header(data, version, offset, length, passphrase):
+    """Mengurai header payload dan menurunkan kunci AES.
+
+    Mengembalikan (kunci AES, field header, posisi awal ciphertext,
+    panjang ciphertext termasuk tag, bytes header untuk associated data).
+    """
+    end = offset + length
+    if version in (FORMAT_LEGACY, FORMAT_TRAILER):
+        pos = offset + len(MARKER) + (1 if version == FORMAT_TRAILER else 0)
+        fields = {FIELD_IV: bytes(data[pos:pos + AES.block_size])}
+        pos += AES.block_size
+        return adjust_key_length(passphrase), fields, pos, end - pos, None
+
+    pos = offset + len(MARKER) + 1
+    (header_len,) = _HEADER_LEN.unpack(data[pos:pos + _HEADER_LEN.size])
+    pos += _HEADER_LEN.size
+    fields = _unpack_fields(data[pos:pos + header_len])
+    pos += header_len
+    try:
+        params = _KDF_PARAMS.unpack(fields[FIELD_KDF])
+        salt = fields[FIELD_SALT]
+    except (KeyError, struct.error):
+        raise StegoError("Header file stego rusak.")
+    _check_kdf(params)
+    return _derive(passphrase, salt, params), fields, pos, end - pos, bytes(data[offset:pos])
+
+
+def _decrypt_cbc(view, aes_key, fields, start, size, header, workers, tracker):
+    if size <= 0 or size % AES.block_size:
+        raise StegoError("Kunci salah atau file rusak.")
+    cipher = AES.new(aes_key, AES.MODE_CBC, fields[FIELD_IV])
+    decrypted = bytearray(size)
+    cipher.decrypt(view[start:start + size], output=decrypted)
+    _unpad_in_place(decrypted)
+    tracker.advance(size)
+    return decrypted
+
+
+def _verify_key(aes_key, fields):
+    """Cek kunci O(1): kunci salah ditolak tanpa menyentuh payload."""
+    check = fields.get(FIELD_CHECK)
+    if check is None or FIELD_IV not in fields:
+        raise StegoError("Header file stego rusak.")
+    if not hmac.compare_digest(check, _key_check(aes_key)):
+        raise StegoError("Kunci salah.")
+
+
+def _decrypt_gcm(view, aes_key, fields, start, size, header, workers, tracker):
+    _verify_key(aes_key, fields)
+    if size < TAG_SIZE:
+        raise StegoError("File rusak atau telah diubah.")
+
+    cipher = AES.new(aes_key, AES.MODE_GCM, nonce=fields[FIELD_IV])
+    cipher.update(header)
+    size -= TAG_SIZE
+    decrypted = bytearray(size)
+    cipher.decrypt(view[start:start + size], output=decrypted)
+    try:
+        cipher.verify(view[start + size:start + size + TAG_SIZE])
+    except ValueError:
+        raise StegoError("File rusak atau telah diubah.")
+    tracker.advance(size + TAG_SIZE)
+    return decrypted
+
+
+def _decrypt_segmented(view, aes_key, fields, start, size, header, workers, tracker):
+    _verify_key(aes_key, fields)
+    try:
+        (segment_size,) = _SEGMENT.unpack(fields[FIELD_SEGMENT])
+    except (KeyError, struct.error):
+        raise StegoError("Header file stego rusak.")
+    nonce_prefix = fields[FIELD_IV]
+    stride = segment_size + TAG_SIZE
+    count = -(-size // stride)
+    plain_size = size - count * TAG_SIZE
+    if segment_size == 0 or count == 0 or size - (count - 1) * stride <= TAG_SIZE:
+        raise StegoError("File rusak atau telah diubah.")
+
+    decrypted = bytearray(plain_size)
+    with memoryview(decrypted) as target:
+        def open_segment(index):
+            pos = start + index * stride
+            end = min(pos + stride, start + size) - TAG_SIZE
+            out_pos = index * segment_size
+            cipher = _segment_cipher(aes_key, nonce_prefix, header, index, index == count - 1)
+            cipher.decrypt(view[pos:end], output=target[out_pos:out_pos + end - pos])
+            try:
+                cipher.verify(view[end:end + TAG_SIZE])
+            except ValueError:
+                raise StegoError("File rusak atau telah diubah.")
+            return end + TAG_SIZE - pos
+
+        for length in _parallel(open_segment, ((i,) for i in range(count)), min(workers, count)):
+            tracker.advance(length)
+    return decrypted
+
+
+_DECRYPTORS = {
+    FORMAT_LEGACY: _decrypt_cbc,
+    FORMAT_TRAILER: _decrypt_cbc,
+    FORMAT_KDF: _decrypt_cbc,
+    FORMAT_GCM: _decrypt_gcm,
+    FORMAT_SEGMENTED: _decrypt_segmented,
+}
+
+
+def extract(stego, key: str, workers: int = None, progress=None, cancel=None):
+    """Mengambil dokumen dari file stego.
+
+    Hanya bagian payload yang disentuh; ciphertext didekripsi langsung dari
+    view mmap ke satu buffer hasil, per segmen di `workers` thread untuk
+    format 4. `progress(selesai, total)` dihitung dalam byte payload; format
+    lama hanya melaporkannya sekali di akhir. Mengembalikan tuple
+    (nama_file, isi_dokumen) dengan isi berupa bytearray, atau bytes bila
+    dokumen tersimpan terkompresi.
+
+    File PNG/WAV hasil mode LSB dikenali sendiri; bit terendahnya hanya
+    dibaca bila file tidak memiliki trailer.
+    """
+    with _mapped(stego) as data:
+        if _locate_trailer(data) is None and bytes(data[:4]) in _LSB_SIGNATURES:
+            import lsb  # numpy dan Pillow hanya dimuat untuk media tanpa trailer
+            # Hanya baris piksel/frame pertama yang didekode bila bukan media LSB
+            payload = lsb.read_payload(data)
+            if payload is not None:
+                return _extract(payload, key, workers, progress, cancel)
+        return _extract(data, key, workers, progress, cancel)
+
+
+def _extract(data, key, workers, progress, cancel):
+    """Mendekripsi payload dari buffer stego yang sudah dipetakan."""
+    version, offset, length = _locate(data)
+    aes_key, fields, start, size, header = _read_header(data, version, offset, length, key)
+    tracker = _Progress(progress, cancel, size)
+    tracker.advance()
+    with memoryview(data) as view:
+        decrypted = _DECRYPTORS[version](view, aes_key, fields, start, size, header,
+                                         _workers(workers), tracker)
+
+    filename_len = int.from_bytes(decrypted[:2], 'big')
+    original_filename = decrypted[2:2 + filename_len].decode(errors='ignore')
+    codec = fields.get(FIELD_CODEC, bytes([CODEC_NONE]))[0]
+    if codec != CODEC_NONE:
+        with memoryview(decrypted) as content:
+            return original_filename, _decompress(content[2 + filename_len:], codec)
+    del decrypted[:2 + filename_len]
+    return original_filename, decrypted
+
+
+class StreamExtractor:
+    """Mengekstrak dokumen format 4 dari aliran byte stego yang datang berurutan.
+
+    Data diberikan lewat `write()` (file object tulis-saja) dan dokumen hasil
+    ditulis ke `output` segera setelah setiap segmen lolos verifikasi tag.
+    Payload ditemukan tanpa trailer: setiap kandidat b'E0F' + versi 4 diuji
+    dengan cek kunci di header-nya. Kesalahan dicatat dan data berikutnya
+    diabaikan; `close()` melempar StegoError atau mengembalikan tuple
+    (nama_file, ukuran_dokumen). Memori yang dipakai sekitar satu segmen.
+    """
+
+    def __init__(self, key: str, output):
+        self._passphrase = key
+        self._output = output
+        self._buffer = bytearray()
+        self._buffer_pos = 0  # posisi absolut buffer[0] di aliran
+        self._error = None
+        self._saw_header = False
+        self._candidates = 0
+        self._payload = None  # (offset, kunci AES, field, ukuran segmen, header)
+        self._index = 0
+        self._name = None
+        self._name_buffer = b''
+        self._decompressor = None
+        self.size = 0
+
+    @property
+    def found(self):
+        """True setelah header format 4 yang cocok dengan kunci ditemukan."""
+        return self._payload is not None
+
+    @property
+    def saw_header(self):
+        """True bila aliran memuat header format 4, cocok dengan kunci atau tidak."""
+        return self._saw_header
+
+    def write(self, data):
+        if self._error is None:
+            self._buffer += data
+            try:
+                if self._payload is None:
+                    self._scan()
+                if self._payload is not None:
+                    self._open_segments(final=False)
+            except StegoError as e:
+                self._error = e
+                self._buffer = bytearray()
+        return len(data)
+
+    def _drop(self, count):
+        del self._buffer[:count]
+        self._buffer_pos += count
+
+    def _scan(self):
+        needle = MARKER + bytes([FORMAT_SEGMENTED])
+        pos = 0
+        while True:
+            pos = self._buffer.find(needle, pos)
+            if pos < 0:
+                # Sisakan ekor yang mungkin awal penanda
+                self._drop(max(0, len(self._buffer) - len(needle) + 1))
+                return
+            start = pos + len(needle) + _HEADER_LEN.size
+            if len(self._buffer) < start:
+                break
+            (header_len,) = _HEADER_LEN.unpack_from(self._buffer, start - _HEADER_LEN.size)
+            if len(self._buffer) < start + header_len:
+                break
+            found = self._try_header(bytes(self._buffer[start:start + header_len]))
+            if found:
+                header = bytes(self._buffer[pos:start + header_len])
+                self._payload = (self._buffer_pos + pos,) + found + (header,)
+                self._drop(start + header_len)
+                return
+            pos += 1
+        # Kandidat header belum lengkap; tunggu data berikutnya
+        self._drop(pos)
+
+    def _try_header(self, data):
+        """Menguji kandidat header; (kunci AES, field, ukuran segmen) bila cocok."""
+        try:
+            fields = _unpack_fields(data)
+            params = _KDF_PARAMS.unpack(fields[FIELD_KDF])
+            (segment_size,) = _SEGMENT.unpack(fields[FIELD_SEGMENT])
+            salt, check = fields[FIELD_SALT], fields[FIELD_CHECK]
+            valid = len(fields[FIELD_IV]) == NONCE_PREFIX_SIZE and segment_size > 0
+            _check_kdf(params)
+        except (StegoError, KeyError, struct.error):
+            valid = False
+        if not valid:
+            return None  # kebetulan ada b'E0F' di media
+        self._saw_header = True
+        # Setiap kandidat menjalankan KDF; aliran dengan banyak header palsu
+        # dihentikan sebelum menghabiskan CPU receiver
+        self._candidates += 1
+        if self._candidates > _MAX_KEY_CANDIDATES:
+            raise StegoError("Terlalu banyak header stego di dalam file.")
+        aes_key = _derive(self._passphrase, salt, params)
+        if not hmac.compare_digest(check, _key_check(aes_key)):
+            return None
+
+        codec = fields.get(FIELD_CODEC, bytes([CODEC_NONE]))[0]
+        if codec == CODEC_ZLIB:
+            self._decompressor = zlib.decompressobj()
+        elif codec == CODEC_LZMA:
+            self._decompressor = lzma.LZMADecompressor()
+        elif codec != CODEC_NONE:
+            raise StegoError("Codec kompresi tidak dikenal.")
+        return aes_key, fields, segment_size
+
+    def _open_segments(self, final):
+        stride = self._payload[3] + TAG_SIZE
+        # Segmen pasti bukan yang terakhir bila masih ada data di belakangnya
+        # selain trailer
+        while len(self._buffer) > stride + _TRAILER.size:
+            self._open_segment(stride, False)
+        if final:
+            size = len(self._buffer) - _TRAILER.size
+            if not TAG_SIZE <= size <= stride:
+                raise StegoError("File rusak atau telah diubah.")
+            self._open_segment(size, True)
+
+    def _open_segment(self, size, final):
+        _, aes_key, fields, _, header = self._payload
+        cipher = _segment_cipher(aes_key, fields[FIELD_IV], header, self._index, final)
+        with memoryview(self._buffer) as view:
+            plain = cipher.decrypt(view[:size - TAG_SIZE])
+            try:
+                cipher.verify(view[size - TAG_SIZE:size])
+            except ValueError:
+                raise StegoError("File rusak atau telah diubah.")
+        self._drop(size)
+        self._index += 1
+        self._emit(plain)
+
+    def _emit(self, plain):
+        if self._name is None:
+            # Awal plaintext: panjang nama file (2 byte) + nama file
+            self._name_buffer += plain
+            if len(self._name_buffer) < 2:
+                return
+            name_len = int.from_bytes(self._name_buffer[:2], 'big')
+            if len(self._name_buffer) < 2 + name_len:
+                return
+            self._name = self._name_buffer[2:2 + name_len].decode(errors='ignore')
+            plain = self._name_buffer[2 + name_len:]
+            self._name_buffer = b''
+        if self._decompressor is not None:
+            try:
+                plain = self._decompressor.decompress(plain)
+            except (zlib.error, lzma.LZMAError):
+                raise StegoError("Data terkompresi rusak.")
+        if plain:
+            self._output.write(plain)
+            self.size += len(plain)
+
+    def close(self):
+        """Menyelesaikan ekstraksi setelah seluruh aliran diterima."""
+        if self._error is not None:
+            raise self._error
+        if self._payload is None:
+            if self._saw_header:
+                raise StegoError("Kunci salah.")
+            raise StegoError("File tidak valid atau bukan file stego format segmen.")
+        if len(self._buffer) < _TRAILER.size:
+            raise StegoError("File rusak atau telah diubah.")
+        offset, length, magic = _TRAILER.unpack(self._buffer[-_TRAILER.size:])
+        end = self._buffer_pos + len(self._buffer) - _TRAILER.size
+        if magic != TRAILER_MAGIC or offset != self._payload[0] or offset + length != end:
+            raise StegoError("File rusak atau telah diubah.")
+        self._open_segments(final=True)
+        if self._name is None:
+            raise StegoError("File rusak atau telah diubah.")
+        if self._decompressor is not None and not self._decompressor.eof:
+            raise StegoError("Data terkompresi rusak.")
+        return self._name, self.size
@@ -0,0 +1,121 @@
+"""Uji format kontainer stego HIDEasy: format lama, codec, dan segmen format 4."""
+from io import BytesIO
+import os
+import sys
+
+import pytest
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import stego  # noqa: E402
+
+
+KEY = "kunci rahasia"
+MEDIA = b'\xff\xd8\xff\xe0' + bytes(range(256)) * 4  # bukan PNG/WAV, tanpa b'E0F'
+DOCUMENT = b"Laporan keuangan kuartal tiga.\n" * 200
+SEGMENT = 512
+
+
+def _embed(compression='none', chunk_size=SEGMENT, document=DOCUMENT):
+    return stego.embed(document, MEDIA, KEY, filename="laporan.txt",
+                       chunk_size=chunk_size, compression=compression)
+
+
+def _segments(data):
+    """Memecah file stego format 4 menjadi (awal, daftar segmen, trailer)."""
+    version, offset, length = stego.locate(data)
+    assert version == stego.FORMAT_SEGMENTED
+    pos = offset + len(stego.MARKER) + 1
+    (header_len,) = stego._HEADER_LEN.unpack(data[pos:pos + stego._HEADER_LEN.size])
+    start = pos + stego._HEADER_LEN.size + header_len
+    body = data[start:offset + length]
+    stride = SEGMENT + stego.TAG_SIZE
+    return data[:start], [body[i:i + stride] for i in range(0, len(body), stride)], offset
+
+
+def _join(head, segments, offset):
+    """Menyusun ulang file stego dengan trailer yang cocok dengan isinya."""
+    payload = head + b''.join(segments)
+    return payload + stego._TRAILER.pack(offset, len(payload) - offset, stego.TRAILER_MAGIC)
+
+
+def test_legacy_format_still_decodes():
+    """File format 0 (tanpa versi dan trailer) dari aplikasi lama tetap terbaca."""
+    iv = os.urandom(AES.block_size)
+    name = b"catatan.txt"
+    plain = len(name).to_bytes(2, 'big') + name + DOCUMENT
+    cipher = AES.new(stego.adjust_key_length(KEY), AES.MODE_CBC, iv)
+    data = MEDIA + stego.MARKER + iv + cipher.encrypt(pad(plain, AES.block_size))
+
+    assert stego.locate(data)[0] == stego.FORMAT_LEGACY
+    filename, document = stego.extract(data, KEY)
+    assert filename == "catatan.txt"
+    assert bytes(document) == DOCUMENT
+
+
+@pytest.mark.parametrize('compression', sorted(stego.COMPRESSION_CODECS))
+def test_round_trip_per_codec(compression):
+    data = _embed(compression)
+    assert data.startswith(MEDIA)
+    filename, document = stego.extract(data, KEY)
+    assert filename == "laporan.txt"
+    assert bytes(document) == DOCUMENT
+
+
+def test_wrong_key_rejected():
+    with pytest.raises(stego.StegoError):
+        stego.extract(_embed(), "kunci lain")
+
+
+def test_tampered_segment_rejected():
+    head, segments, offset = _segments(_embed())
+    segment = bytearray(segments[1])
+    segment[10] ^= 0x01
+    segments[1] = bytes(segment)
+    with pytest.raises(stego.StegoError):
+        stego.extract(_join(head, segments, offset), KEY)
+
+
+def test_truncated_segments_rejected():
+    """Segmen terakhir yang dibuang terdeteksi walau trailer ikut disesuaikan."""
+    head, segments, offset = _segments(_embed())
+    assert len(segments) > 2
+    with pytest.raises(stego.StegoError):
+        stego.extract(_join(head, segments[:-1], offset), KEY)
+
+
+def test_reordered_segments_rejected():
+    head, segments, offset = _segments(_embed())
+    segments[0], segments[1] = segments[1], segments[0]
+    with pytest.raises(stego.StegoError):
+        stego.extract(_join(head, segments, offset), KEY)
+
+
+@pytest.mark.parametrize('compression', sorted(stego.COMPRESSION_CODECS))
+def test_stream_extractor_matches_extract(compression):
+    """Aliran yang datang sepotong-sepotong menghasilkan dokumen yang sama."""
+    document = DOCUMENT + os.urandom(3000)
+    data = _embed(compression, document=document)
+    output = BytesIO()
+    extractor = stego.StreamExtractor(KEY, output)
+    for pos in range(0, len(data), 333):
+        extractor.write(data[pos:pos + 333])
+
+    filename, size = extractor.close()
+    expected_name, expected = stego.extract(data, KEY)
+    assert filename == expected_name
+    assert size == len(expected)
+    assert output.getvalue() == bytes(expected) == document
+
+
+def test_stream_extractor_rejects_tampering():
+    head, segments, offset = _segments(_embed())
+    segment = bytearray(segments[2])
+    segment[0] ^= 0x80
+    segments[2] = bytes(segment)
+    extractor = stego.StreamExtractor(KEY, BytesIO())
+    extractor.write(_join(head, segments, offset))
+    with pytest.raises(stego.StegoError):
+        extractor.close()
@@ -0,0 +1,78 @@
+"""Uji loopback protokol transfer HIDEasy."""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transfer  # noqa: E402
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Kondisi tidak tercapai sebelum batas waktu.")
+        time.sleep(0.01)
+
+
+def test_resend_takes_over_stalled_connection(tmp_path):
+    """Koneksi yang macet di tengah body (Wi-Fi putus diam-diam) tidak boleh
+    menghalangi sender yang menyambung ulang; sisa file dilanjutkan dari
+    potongan yang sudah terverifikasi."""
+    source = tmp_path / "foto_stego.png"
+    data = os.urandom(3 * transfer.DATA_FRAME_SIZE + 1234)
+    source.write_bytes(data)
+    received_dir = tmp_path / "receiver"
+    received_dir.mkdir()
+
+    service = transfer.ReceiverService("127.0.0.1", 0, temp_dir=str(received_dir))
+    service.start()
+    try:
+        metadata, chunk_digests = transfer._file_metadata(str(source))
+        stalled = transfer._connect("127.0.0.1", service.port, 10)
+        try:
+            transfer.send_frame(stalled, transfer.FRAME_HEADER, transfer._pack_header(metadata))
+            assert transfer._read_resume(stalled, metadata) == 0
+            with open(source, 'rb') as f:
+                transfer._send_data_frames(stalled, f, 0, transfer.DATA_FRAME_SIZE,
+                                           chunk_digests)
+            partial = transfer._partial_path(str(received_dir), metadata)
+            _wait_for(lambda: os.path.exists(partial)
+                      and os.path.getsize(partial) >= transfer.DATA_FRAME_SIZE)
+
+            # Koneksi lama tetap terbuka tanpa data, seperti link yang hilang
+            metrics = transfer.TransferMetrics('send')
+            start = time.monotonic()
+            assert transfer.send_file(str(source), "127.0.0.1", service.port,
+                                      retries=0, metrics=metrics)
+            assert time.monotonic() - start < transfer.RECEIVE_TIMEOUT
+        finally:
+            stalled.close()
+
+        assert metrics.resumed_bytes == transfer.DATA_FRAME_SIZE
+        _wait_for(lambda: not service.received.empty())
+        item = service.take()
+        with open(item.path, 'rb') as f:
+            assert f.read() == data
+        os.remove(item.path)
+    finally:
+        service.stop()
+
+
+def test_sweep_removes_only_stale_partials(tmp_path):
+    """File setengah jadi yang ditinggalkan dihapus; yang baru dan yang sudah
+    lengkap (.part) tetap ada."""
+    stale = [tmp_path / ".hideasy_aa.partial", tmp_path / ".hideasy_bb.ranges"]
+    fresh = tmp_path / ".hideasy_cc.partial"
+    done = tmp_path / ".hideasy_dd.part"
+    other = tmp_path / "foto.partial"
+    old = time.time() - transfer.PARTIAL_MAX_AGE - 60
+    for path in stale + [fresh, done, other]:
+        path.write_bytes(b"x")
+    for path in stale + [done, other]:
+        os.utime(path, (old, old))
+
+    assert transfer.sweep_partials(str(tmp_path)) == len(stale)
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [fresh.name, done.name, other.name])
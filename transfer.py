@@ -0,0 +1,1562 @@
+"""Protokol transfer file HIDEasy (sender/receiver TCP) tanpa Kivy.
+
+Dipakai oleh SenderScreen dan ReceiverScreen, serta bisa dijalankan headless
+dari skrip benchmark. Callback opsional dipanggil dari thread jaringan;
+pemanggil dari UI bertanggung jawab meneruskannya ke Clock Kivy.
+
+Semua pesan dikirim sebagai frame: tipe (1 byte) + panjang (4 byte) + isi.
+Urutan satu transfer:
+    sender   -> HEADER  magic + versi + metadata JSON (nama, ukuran, sha256,
+                        ukuran potongan)
+    receiver -> RESUME  offset terakhir yang sudah terverifikasi (JSON)
+    sender   -> DATA + CHECK, berulang: satu potongan isi file diikuti
+                        SHA-256 potongan itu
+    sender   -> END
+    receiver -> ACK, atau ERROR berisi pesan kesalahan
+
+Receiver menyimpan file setengah jadi dengan nama yang diturunkan dari
+SHA-256 file. Bila koneksi putus, file itu dipotong ke batas potongan
+terakhir yang lolos verifikasi, dan sender yang menyambung ulang cukup
+melanjutkan dari offset di frame RESUME. File setengah jadi yang lama tidak
+disentuh dihapus oleh sweep_partials. ACK hanya dikirim setelah ukuran
+dan SHA-256 seluruh file cocok; file terpotong tidak pernah dilaporkan
+berhasil.
+
+Mode multi-stream (`send_file(..., streams=N)`) membagi file menjadi N
+rentang potongan yang dikirim lewat N koneksi paralel. Metadata tiap koneksi
+membawa `range`, `transfer` (id acak per pengiriman) dan `chunks` (SHA-256
+dari rangkaian digest semua potongan); receiver menulis setiap rentang langsung ke posisinya di file
+yang sudah dialokasikan penuh. ACK tiap rentang berisi `complete`. Koneksi
+yang menuntaskan rentang terakhir memverifikasi seluruh file dari digest
+potongan yang sudah dicek saat diterima, tanpa membaca ulang file.
+
+send_stream mengirim data yang belum ada di disk (mis. hasil embed yang
+ditulis langsung ke socket). Ukuran dan SHA-256 baru diketahui di akhir,
+sehingga metadata HEADER membawa `stream` dan keduanya dikirim sebagai isi
+frame END. Mode ini tidak bisa dilanjutkan karena datanya tidak bisa dibuat
+ulang persis sama.
+
+Bila receiver diberi kunci (`extract_key`), file stego format 4 diekstrak
+sambil diterima lewat stego.StreamExtractor: yang ditulis ke disk hanya
+dokumen hasil ekstraksi, bukan file stego-nya. Sampai header format 4
+ditemukan, aliran juga disalin ke file sementara; file tanpa header itu
+(mode LSB, format 0-3) diekstrak dengan stego.extract sebelum ACK, dan bila
+tetap gagal disimpan apa adanya sebagai file biasa.
+
+Penolakan receiver (frame ERROR) dilempar di sender sebagai ReceiverRefused
+yang membawa pesan dari receiver, mis. "Kunci salah.".
+
+send_files mengirim banyak file lewat satu koneksi: setelah END satu file,
+sender langsung mengirim HEADER file berikutnya, dan receiver melayani
+koneksi itu sampai sender menutupnya.
+
+Karena setiap frame membawa panjangnya sendiri, protokol tidak bergantung
+pada batas recv() dan aman walaupun TCP menggabungkan beberapa write.
+
+Sender mengirim isi file dengan socket.sendfile (zero-copy di kernel) per
+frame DATA besar; pada platform tanpa os.sendfile dipakai pengiriman
+per potongan lewat buffer yang dipakai ulang. Receiver menulis isi frame DATA
+langsung ke file sementara lewat satu buffer yang dipakai ulang (recv_into),
+sehingga memori tetap konstan berapa pun ukuran filenya.
+
+ReceiverService menjalankan server yang tetap hidup: banyak sender dilayani
+bersamaan oleh thread pool, dan file yang selesai diterima disimpan di
+antrian berbatas sampai diambil oleh pemanggil.
+
+Setiap transfer dicatat di TransferMetrics (byte, laju, ETA, durasi tiap
+fase, RTT, jumlah percobaan ulang dan resume). Objeknya bisa dibaca berkala
+dari thread UI untuk progress bar dan ditambahkan ke log JSON-lines.
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import queue
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+import stego
+
+
+PORT = 12345  # Port default
+MAGIC = b'HDEZ'
+PROTOCOL_VERSION = 2
+CHUNK_SIZE = 256 * 1024  # ukuran buffer baca/tulis
+DATA_FRAME_SIZE = 4 * 1024 * 1024  # satu potongan berverifikasi = satu frame DATA
+MAX_DATA_FRAME = 64 * 1024 * 1024  # batas ukuran potongan yang diterima
+STREAM_FRAME_SIZE = 1024 * 1024  # potongan mode stream; kecil agar byte pertama cepat terkirim
+RECEIVE_TIMEOUT = 60  # detik tanpa data sebelum koneksi di receiver dianggap putus
+PARTIAL_MAX_AGE = 24 * 60 * 60  # detik sebelum file setengah jadi yang ditinggalkan dihapus
+# Laju minimum receiver memproses file (verifikasi/ekstraksi) sebelum ACK;
+# sender menambah batas waktu tunggu ACK sesuai ukuran file
+ACK_RATE = 8 * 1024 * 1024
+
+_FRAME = struct.Struct('>BI')  # tipe, panjang isi
+FRAME_HEADER = 1
+FRAME_DATA = 2
+FRAME_END = 3
+FRAME_ACK = 4
+FRAME_ERROR = 5
+FRAME_RESUME = 6
+FRAME_CHECK = 7
+
+_MAX_CONTROL_FRAME = 64 * 1024  # batas frame selain DATA
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+ReceivedFile = namedtuple('ReceivedFile', 'name path size address extracted', defaults=(False,))
+
+
+class TransferError(Exception):
+    """Kesalahan protokol atau koneksi saat transfer."""
+
+
+class ReceiverRefused(TransferError):
+    """Receiver membalas ERROR; pesannya (dari receiver) ada di str(e)."""
+
+
+class TransferMetrics:
+    """Metrik satu transfer (atau satu batch) untuk progres live dan log.
+
+    Diisi dari thread jaringan dan aman dibaca dari thread lain, mis. Clock
+    Kivy yang memperbarui progress bar. Durasi fase dicatat berurutan lewat
+    `mark`: connect, handshake (HEADER sampai RESUME), body, verify
+    (receiver), ack, dan retry untuk waktu yang hilang sebelum menyambung
+    ulang. Pada batch dan multi-stream durasinya dijumlahkan.
+    """
+
+    def __init__(self, direction, name=None, total=None, peer=None):
+        self.direction = direction  # 'send' atau 'receive'
+        self.name = name
+        self.total = total  # None bila ukuran belum diketahui (mode stream)
+        self.peer = peer
+        self.transferred = 0  # posisi progres
+        self.moved = 0  # byte yang benar-benar lewat jaringan, termasuk kiriman ulang
+        self.retransmitted = 0
+        self.retries = 0
+        self.resumes = 0
+        self.resumed_bytes = 0
+        self.rtt = None
+        self.phases = {}
+        self.ok = None
+        self.error = None
+        self.started = time.time()
+        self._start = self._mark = time.perf_counter()
+        self._body_start = None
+        self._end = None
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        """Menambahkan waktu sejak mark sebelumnya ke `phase`; mengembalikan detiknya."""
+        now = time.perf_counter()
+        with self._lock:
+            seconds = now - self._mark
+            self._mark = now
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        return seconds
+
+    def observe_rtt(self, seconds):
+        with self._lock:
+            self.rtt = seconds if self.rtt is None else min(self.rtt, seconds)
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+        self.mark('retry')
+
+    def resumed(self, skipped):
+        """Dipanggil setelah RESUME; `skipped` byte tidak perlu dikirim lagi."""
+        if skipped > 0:
+            with self._lock:
+                self.resumes += 1
+                self.resumed_bytes += skipped
+
+    def update(self, position, moved=0):
+        """Posisi progres baru dan jumlah byte yang baru saja dikirim/diterima.
+
+        Posisi yang mundur (koneksi putus lalu dilanjutkan) dihitung sebagai
+        byte yang harus dikirim ulang.
+        """
+        with self._lock:
+            if self._body_start is None:
+                self._body_start = time.perf_counter()
+            if position < self.transferred:
+                self.retransmitted += self.transferred - position
+            self.transferred = position
+            self.moved += moved
+
+    def merge(self, other):
+        """Menggabungkan fase dan hitungan dari metrik satu koneksi multi-stream."""
+        with self._lock:
+            for phase, seconds in other.phases.items():
+                self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+            self.retries += other.retries
+            self.resumes += other.resumes
+            self.resumed_bytes += other.resumed_bytes
+            if other.rtt is not None:
+                self.rtt = other.rtt if self.rtt is None else min(self.rtt, other.rtt)
+
+    def finish(self, ok, error=None):
+        self.ok = ok
+        self.error = str(error) if error is not None else None
+        self._end = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return (self._end or time.perf_counter()) - self._start
+
+    @property
+    def rate(self):
+        """Byte per detik sejak isi file mulai mengalir."""
+        if self._body_start is None:
+            return 0.0
+        seconds = (self._end or time.perf_counter()) - self._body_start
+        return self.moved / seconds if seconds > 0 else 0.0
+
+    @property
+    def fraction(self):
+        """Progres 0..1, atau None bila ukuran total belum diketahui."""
+        if not self.total:
+            return None if self.total is None else 1.0
+        return min(1.0, self.transferred / self.total)
+
+    @property
+    def eta(self):
+        """Perkiraan sisa detik, atau None bila belum bisa dihitung."""
+        rate = self.rate
+        if self.total is None or not rate:
+            return None
+        return max(0, self.total - self.transferred) / rate
+
+    def as_dict(self):
+        with self._lock:
+            phases = dict(self.phases)
+        return {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'direction': self.direction,
+            'name': self.name,
+            'peer': list(self.peer) if self.peer else None,
+            'ok': self.ok,
+            'error': self.error,
+            'total': self.total,
+            'transferred': self.transferred,
+            'moved': self.moved,
+            'seconds': round(self.elapsed, 6),
+            'rate': round(self.rate, 1),
+            'rtt': None if self.rtt is None else round(self.rtt, 6),
+            'phases': {phase: round(seconds, 6) for phase, seconds in phases.items()},
+            'retries': self.retries,
+            'resumes': self.resumes,
+            'resumed_bytes': self.resumed_bytes,
+            'retransmitted': self.retransmitted,
+        }
+
+    def write_log(self, path):
+        """Menambahkan metrik ini sebagai satu baris JSON ke `path`."""
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.as_dict()) + '\n')
+
+
+def _tracked(metrics, run):
+    """Menjalankan `run()` dan mencatat hasil atau kesalahannya di `metrics`."""
+    try:
+        result = run()
+    except BaseException as e:
+        metrics.finish(False, e)
+        raise
+    metrics.finish(bool(result))
+    return result
+
+
+def _recv_into(sock, view):
+    """Mengisi view sampai penuh dari socket."""
+    received = 0
+    while received < len(view):
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise TransferError("Koneksi terputus sebelum data lengkap.")
+        received += count
+
+
+def _recv_exact(sock, size):
+    buffer = bytearray(size)
+    _recv_into(sock, memoryview(buffer))
+    return buffer
+
+
+def send_frame(sock, frame_type, payload=b''):
+    sock.sendall(_FRAME.pack(frame_type, len(payload)) + payload)
+
+
+def _recv_frame_header(sock, max_size):
+    frame_type, size = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    if size > max_size:
+        raise TransferError("Frame terlalu besar.")
+    return frame_type, size
+
+
+def recv_frame(sock, max_size=_MAX_CONTROL_FRAME):
+    """Menerima satu frame utuh; mengembalikan (tipe, isi)."""
+    frame_type, size = _recv_frame_header(sock, max_size)
+    return frame_type, _recv_exact(sock, size)
+
+
+def _expect(frame, *types):
+    if frame[0] not in types:
+        raise TransferError(f"Frame tak terduga: {frame[0]}")
+    return frame
+
+
+def _file_digests(path, chunk_size):
+    """SHA-256 seluruh file (hex) beserta digest tiap potongan `chunk_size`."""
+    digest = hashlib.sha256()
+    chunks = []
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+            chunks.append(hashlib.sha256(chunk).digest())
+    return digest.hexdigest(), chunks
+
+
+def _connect(host, port, timeout):
+    sock = socket.create_connection((host, port), timeout=timeout)
+    # Frame kontrol kecil langsung dikirim tanpa menunggu Nagle
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _pack_header(metadata):
+    return MAGIC + bytes([PROTOCOL_VERSION]) + json.dumps(metadata).encode('utf-8')
+
+
+def _unpack_header(payload):
+    if payload[:len(MAGIC)] != MAGIC:
+        raise TransferError("Bukan koneksi HIDEasy.")
+    version = payload[len(MAGIC)]
+    if version != PROTOCOL_VERSION:
+        raise TransferError(f"Versi protokol {version} tidak didukung.")
+    try:
+        metadata = json.loads(bytes(payload[len(MAGIC) + 1:]).decode('utf-8'))
+        metadata['name'] = os.path.basename(metadata['name'])
+        if metadata.get('stream'):
+            return _unpack_stream_header(metadata)
+        metadata['size'] = int(metadata['size'])
+        metadata['chunk_size'] = int(metadata['chunk_size'])
+        sha256 = metadata['sha256']
+        # sha256 juga dipakai sebagai nama file setengah jadi
+        bytes.fromhex(sha256)
+        if 'range' in metadata:
+            start, end = metadata['range']
+            metadata['range'] = (int(start), int(end))
+            bytes.fromhex(metadata['chunks'])
+            metadata['transfer'] = str(metadata['transfer'])
+    except (ValueError, KeyError, TypeError):
+        raise TransferError("Header transfer rusak.")
+    size, chunk_size = metadata['size'], metadata['chunk_size']
+    if len(sha256) != 2 * _DIGEST_SIZE or size < 0 or not 0 < chunk_size <= MAX_DATA_FRAME:
+        raise TransferError("Header transfer rusak.")
+    if 'range' in metadata:
+        start, end = metadata['range']
+        if not 0 <= start < end <= size or start % chunk_size \
+                or (end != size and end % chunk_size):
+            raise TransferError("Rentang transfer tidak valid.")
+        if len(metadata['chunks']) != 2 * _DIGEST_SIZE:
+            raise TransferError("Header transfer rusak.")
+    return metadata
+
+
+def _unpack_stream_header(metadata):
+    try:
+        metadata['chunk_size'] = int(metadata['chunk_size'])
+    except (ValueError, KeyError, TypeError):
+        raise TransferError("Header transfer rusak.")
+    if not 0 < metadata['chunk_size'] <= MAX_DATA_FRAME or not metadata['name']:
+        raise TransferError("Header transfer rusak.")
+    return metadata
+
+
+def _send_data_frames(sock, f, start, end, chunk_digests, on_position=None):
+    """Mengirim isi file [start, end) sebagai pasangan frame DATA + CHECK.
+
+    Isi DATA dikirim zero-copy bila memungkinkan. `on_position(offset,
+    jumlah)` dipanggil dengan offset absolut setiap satu potongan selesai.
+    """
+    use_sendfile = hasattr(os, 'sendfile')
+    buffer = None
+    sent = start
+    while sent < end:
+        count = min(DATA_FRAME_SIZE, end - sent)
+        sock.sendall(_FRAME.pack(FRAME_DATA, count))
+        if use_sendfile:
+            if sock.sendfile(f, sent, count) != count:
+                raise TransferError("File berubah saat dikirim.")
+        else:
+            if buffer is None:
+                buffer = memoryview(bytearray(CHUNK_SIZE))
+            f.seek(sent)
+            remaining = count
+            while remaining:
+                read = f.readinto(buffer[:min(CHUNK_SIZE, remaining)])
+                if not read:
+                    raise TransferError("File berubah saat dikirim.")
+                sock.sendall(buffer[:read])
+                remaining -= read
+        send_frame(sock, FRAME_CHECK, chunk_digests[sent // DATA_FRAME_SIZE])
+        sent += count
+        if on_position:
+            on_position(sent, count)
+
+
+def _read_reply(payload):
+    try:
+        return json.loads(bytes(payload).decode('utf-8')) if payload else {}
+    except ValueError:
+        raise TransferError("Balasan receiver rusak.")
+
+
+def _check_refused(frame):
+    frame_type, payload = frame
+    if frame_type == FRAME_ERROR:
+        raise ReceiverRefused(bytes(payload).decode(errors='replace'))
+    return frame
+
+
+def _read_resume(sock, metadata):
+    """Membaca balasan HEADER; mengembalikan offset awal atau melempar ReceiverRefused."""
+    start, end = metadata.get('range', (0, metadata['size']))
+    _, payload = _check_refused(_expect(recv_frame(sock), FRAME_RESUME, FRAME_ERROR))
+    try:
+        offset = int(_read_reply(payload)['offset'])
+    except (KeyError, TypeError, ValueError):
+        raise TransferError("Balasan RESUME rusak.")
+    if not start <= offset <= end or offset % DATA_FRAME_SIZE and offset != end:
+        raise TransferError("Offset RESUME tidak valid.")
+    return offset
+
+
+def _send_body(sock, path, metadata, chunk_digests, offset, on_position):
+    end = metadata.get('range', (0, metadata['size']))[1]
+    if on_position:
+        on_position(offset, 0)
+    with open(path, 'rb') as f:
+        _send_data_frames(sock, f, offset, end, chunk_digests, on_position)
+    send_frame(sock, FRAME_END)
+
+
+def _read_ack(sock, size=0):
+    """Mengembalikan isi ACK (dict); ERROR dilempar sebagai ReceiverRefused.
+
+    Receiver baru membalas setelah file `size` byte selesai diverifikasi atau
+    diekstrak, jadi batas waktu baca diperpanjang sesuai ukurannya.
+    """
+    timeout = sock.gettimeout()
+    if timeout is not None:
+        sock.settimeout(timeout + size / ACK_RATE)
+    try:
+        _, payload = _check_refused(_expect(recv_frame(sock), FRAME_ACK, FRAME_ERROR))
+    finally:
+        sock.settimeout(timeout)
+    return _read_reply(payload)
+
+
+def _send_attempt(sock, path, metadata, chunk_digests, on_position, metrics):
+    """Satu koneksi: handshake RESUME lalu kirim sisa file atau rentangnya.
+
+    Mengembalikan isi ACK (dict); penolakan dilempar sebagai ReceiverRefused.
+    """
+    metrics.mark('connect')
+    send_frame(sock, FRAME_HEADER, _pack_header(metadata))
+    offset = _read_resume(sock, metadata)
+    # HEADER -> RESUME tepat satu round trip
+    metrics.observe_rtt(metrics.mark('handshake'))
+    metrics.resumed(offset - metadata.get('range', (0,))[0])
+    _send_body(sock, path, metadata, chunk_digests, offset, on_position)
+    metrics.mark('body')
+    ack = _read_ack(sock, metadata['size'])
+    metrics.mark('ack')
+    return ack
+
+
+def _send_with_retry(path, host, port, timeout, metadata, chunk_digests, on_position,
+                     retries, retry_delay, metrics):
+    """Mengirim dengan percobaan ulang untuk koneksi yang putus di tengah jalan.
+
+    Bila receiver belum pernah menjawab HEADER (IP salah, receiver belum
+    dibuka), kesalahannya langsung dilempar: mengulang hanya memperlama
+    kegagalan.
+    """
+    attempt = 0
+    while True:
+        try:
+            with _connect(host, port, timeout) as sock:
+                return _send_attempt(sock, path, metadata, chunk_digests, on_position, metrics)
+        except ReceiverRefused:
+            raise  # jawaban pasti dari receiver; mengulang tidak mengubahnya
+        except (OSError, TransferError):
+            attempt += 1
+            # RTT baru tercatat setelah RESUME pertama diterima
+            if metrics.rtt is None or attempt > retries:
+                raise
+            time.sleep(retry_delay)
+            metrics.retried()
+
+
+def _file_metadata(path):
+    sha256, chunk_digests = _file_digests(path, DATA_FRAME_SIZE)
+    metadata = {
+        'name': os.path.basename(path),
+        'size': os.path.getsize(path),
+        'sha256': sha256,
+        'chunk_size': DATA_FRAME_SIZE,
+    }
+    return metadata, chunk_digests
+
+
+def _split_ranges(size, chunk_size, streams):
+    """Membagi file menjadi paling banyak `streams` rentang sejajar potongan."""
+    chunks = -(-size // chunk_size)
+    per_stream = -(-chunks // max(1, streams)) if chunks else 0
+    return [(start * chunk_size, min(size, (start + per_stream) * chunk_size))
+            for start in range(0, chunks, per_stream or 1)]
+
+
+def send_file(path, host, port=PORT, timeout=10, on_progress=None, retries=3,
+              retry_delay=1.0, streams=1, metrics=None):
+    """Mengirim file ke receiver melalui TCP.
+
+    Bila koneksi putus, sender menyambung ulang hingga `retries` kali dan
+    melanjutkan dari offset terakhir yang sudah diverifikasi receiver;
+    receiver yang tidak bisa dihubungi sama sekali tidak dicoba ulang.
+    Dengan `streams` > 1, rentang file dikirim lewat beberapa koneksi
+    paralel. `on_progress(terkirim, total)` dipanggil setiap satu potongan
+    selesai; `metrics` (TransferMetrics) bisa diberikan untuk dibaca dari
+    thread lain. Mengembalikan True bila receiver membalas ACK. Bila receiver
+    menolak file (mis. checksum tidak cocok, kunci salah, antrian penuh),
+    ReceiverRefused dilempar dengan pesan dari receiver.
+    """
+    if metrics is None:
+        metrics = TransferMetrics('send')
+    metrics.name, metrics.peer = os.path.basename(path), (host, port)
+    metrics.total = os.path.getsize(path)
+    return _tracked(metrics, lambda: _send_file(path, host, port, timeout, on_progress,
+                                                retries, retry_delay, streams, metrics))
+
+
+def _send_file(path, host, port, timeout, on_progress, retries, retry_delay, streams, metrics):
+    metadata, chunk_digests = _file_metadata(path)
+    size = metadata['size']
+    ranges = _split_ranges(size, DATA_FRAME_SIZE, streams)
+    if len(ranges) <= 1:
+        def on_position(offset, count):
+            metrics.update(offset, count)
+            if on_progress:
+                on_progress(offset, size)
+        _send_with_retry(path, host, port, timeout, metadata, chunk_digests,
+                         on_position, retries, retry_delay, metrics)
+        return True
+
+    positions = {start: start for start, _ in ranges}
+    lock = threading.Lock()
+
+    def tracker(start):
+        def on_position(offset, count):
+            with lock:
+                positions[start] = offset
+                sent = sum(pos - begin for begin, pos in positions.items())
+                metrics.update(sent, count)
+            if on_progress:
+                on_progress(sent, size)
+        return on_position
+
+    # Receiver memverifikasi file lengkap dari digest potongan, bukan isinya;
+    # id transfer membedakan percobaan ulang dari pengiriman baru file yang sama
+    chunks = hashlib.sha256(b''.join(chunk_digests)).hexdigest()
+    transfer_id = os.urandom(8).hex()
+    # Fase dicatat per koneksi lalu digabung agar mark tidak saling menimpa
+    range_metrics = [TransferMetrics('send') for _ in ranges]
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(_send_with_retry, path, host, port, timeout,
+                                   dict(metadata, range=[start, end], chunks=chunks,
+                                        transfer=transfer_id),
+                                   chunk_digests,
+                                   tracker(start), retries, retry_delay, range_metrics[i])
+                       for i, (start, end) in enumerate(ranges)]
+            replies = [future.result() for future in futures]
+    finally:
+        for child in range_metrics:
+            metrics.merge(child)
+    return any(reply.get('complete') for reply in replies)
+
+
+class BatchResult(namedtuple('BatchResult', 'succeeded failed bytes seconds errors')):
+    """Ringkasan send_files; `bytes` hanya menghitung file yang berhasil.
+
+    `errors` memetakan path file yang ditolak ke pesan dari receiver.
+    """
+    __slots__ = ()
+
+    @property
+    def throughput(self):
+        """Rata-rata byte per detik untuk seluruh batch."""
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+def _send_batch(sock, jobs, prepare, on_position, finish, metrics):
+    """Mengirim beberapa file berurutan lewat satu koneksi.
+
+    HEADER file berikutnya dikirim sebelum ACK file sebelumnya dibaca, dan
+    digest file berikutnya dihitung di latar selama file sekarang dikirim,
+    sehingga tidak ada jeda satu round trip per file.
+    """
+    pending = None
+    for position, (index, path) in enumerate(jobs):
+        metadata, chunk_digests = prepare(index).result()
+        send_frame(sock, FRAME_HEADER, _pack_header(metadata))
+        if pending is not None:
+            _finish_batch_file(sock, pending, finish)
+            metrics.mark('ack')
+            pending = None
+        try:
+            offset = _read_resume(sock, metadata)
+        except ReceiverRefused as e:
+            offset = None
+            finish(index, False, str(e))
+        handshake = metrics.mark('handshake')
+        if position == 0:
+            # Hanya HEADER pertama yang tidak tumpang tindih dengan ACK sebelumnya
+            metrics.observe_rtt(handshake)
+        if offset is None:
+            continue
+        metrics.resumed(offset)
+        if position + 1 < len(jobs):
+            prepare(jobs[position + 1][0])
+        _send_body(sock, path, metadata, chunk_digests, offset, on_position(index))
+        metrics.mark('body')
+        pending = index, metadata['size']
+    if pending is not None:
+        _finish_batch_file(sock, pending, finish)
+        metrics.mark('ack')
+
+
+def _finish_batch_file(sock, pending, finish):
+    index, size = pending
+    try:
+        _read_ack(sock, size)
+    except ReceiverRefused as e:
+        finish(index, False, str(e))
+    else:
+        finish(index, True)
+
+
+def send_files(paths, host, port=PORT, timeout=10, on_progress=None, on_file_done=None,
+               retries=3, retry_delay=1.0, metrics=None):
+    """Mengirim banyak file lewat satu koneksi yang tetap terbuka.
+
+    Setiap file tetap mendapat ACK/ERROR sendiri; `on_file_done(path, ok)`
+    dipanggil per file (pesan penolakan ada di BatchResult.errors), sedangkan `on_progress(terkirim, total)` dan
+    `metrics` mencakup seluruh batch. Bila koneksi putus, sender menyambung
+    ulang dan melanjutkan dari file (dan offset) yang belum dikonfirmasi.
+    Mengembalikan BatchResult.
+    """
+    sizes = [os.path.getsize(path) for path in paths]
+    total = sum(sizes)
+    if metrics is None:
+        metrics = TransferMetrics('send')
+    metrics.name, metrics.total, metrics.peer = f"{len(paths)} file", total, (host, port)
+    positions = [0] * len(paths)
+    results = {}
+    errors = {}
+    prepared = {}
+    start = time.perf_counter()
+
+    def on_position(index):
+        def update(offset, count):
+            positions[index] = offset
+            metrics.update(sum(positions), count)
+            if on_progress:
+                on_progress(sum(positions), total)
+        return update
+
+    def finish(index, ok, error=None):
+        results[index] = ok
+        if error is not None:
+            errors[paths[index]] = error
+        if on_file_done:
+            on_file_done(paths[index], ok)
+
+    def run():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            def prepare(index):
+                if index not in prepared:
+                    prepared[index] = pool.submit(_file_metadata, paths[index])
+                return prepared[index]
+
+            attempt = 0
+            while len(results) < len(paths):
+                jobs = [(i, path) for i, path in enumerate(paths) if i not in results]
+                try:
+                    with _connect(host, port, timeout) as sock:
+                        metrics.mark('connect')
+                        _send_batch(sock, jobs, prepare, on_position, finish, metrics)
+                except (OSError, TransferError):
+                    attempt += 1
+                    # Seperti send_file: receiver yang tak terjangkau tidak dicoba ulang
+                    if metrics.rtt is None or attempt > retries:
+                        raise
+                    time.sleep(retry_delay)
+                    metrics.retried()
+        return all(results.values())
+
+    _tracked(metrics, run)
+    succeeded = [path for i, path in enumerate(paths) if results[i]]
+    failed = [path for i, path in enumerate(paths) if not results[i]]
+    sent = sum(size for i, size in enumerate(sizes) if results[i])
+    return BatchResult(succeeded, failed, sent, time.perf_counter() - start, errors)
+
+
+class _StreamWriter:
+    """File object tulis-saja yang meneruskan isinya ke socket.
+
+    Data dikumpulkan sampai STREAM_FRAME_SIZE lalu dikirim sebagai DATA +
+    CHECK, sehingga memori yang dipakai hanya satu potongan.
+    """
+
+    def __init__(self, sock, on_position=None):
+        self._sock = sock
+        self._buffer = bytearray()
+        self._on_position = on_position
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        view = memoryview(data).cast('B')
+        written = len(view)
+        if self._buffer:
+            take = STREAM_FRAME_SIZE - len(self._buffer)
+            self._buffer += view[:take]
+            view = view[take:]
+            if len(self._buffer) < STREAM_FRAME_SIZE:
+                return written
+            self._send(self._buffer)
+            self._buffer = bytearray()
+        # Potongan penuh dikirim langsung dari buffer pemanggil tanpa disalin
+        while len(view) >= STREAM_FRAME_SIZE:
+            self._send(view[:STREAM_FRAME_SIZE])
+            view = view[STREAM_FRAME_SIZE:]
+        self._buffer += view
+        return written
+
+    def flush(self):
+        if self._buffer:
+            self._send(self._buffer)
+            self._buffer = bytearray()
+
+    def _send(self, chunk):
+        self._sock.sendall(_FRAME.pack(FRAME_DATA, len(chunk)))
+        self._sock.sendall(chunk)
+        send_frame(self._sock, FRAME_CHECK, hashlib.sha256(chunk).digest())
+        self.digest.update(chunk)
+        self.size += len(chunk)
+        if self._on_position:
+            self._on_position(self.size, len(chunk))
+
+
+def send_stream(write_to, name, host, port=PORT, timeout=10, on_progress=None, size_hint=None,
+                metrics=None):
+    """Mengirim data yang dihasilkan `write_to(file_object)` tanpa file perantara.
+
+    Contoh: `send_stream(lambda out: stego.embed_to(doc, media, key, out),
+    nama, ip)`. `on_progress(terkirim, size_hint)` dipanggil per potongan;
+    `size_hint` hanya perkiraan untuk tampilan progres dan menjadi total di
+    `metrics`. Mengembalikan True bila receiver membalas ACK; penolakan
+    dilempar sebagai ReceiverRefused. Tidak ada percobaan ulang otomatis.
+    """
+    if metrics is None:
+        metrics = TransferMetrics('send')
+    metrics.name, metrics.total, metrics.peer = os.path.basename(name), size_hint, (host, port)
+    return _tracked(metrics, lambda: _send_stream(write_to, name, host, port, timeout,
+                                                  on_progress, size_hint, metrics))
+
+
+def _send_stream(write_to, name, host, port, timeout, on_progress, size_hint, metrics):
+    metadata = {'name': os.path.basename(name), 'stream': True, 'chunk_size': STREAM_FRAME_SIZE}
+    with _connect(host, port, timeout) as sock:
+        metrics.mark('connect')
+        send_frame(sock, FRAME_HEADER, _pack_header(metadata))
+        _check_refused(_expect(recv_frame(sock), FRAME_RESUME, FRAME_ERROR))
+        metrics.observe_rtt(metrics.mark('handshake'))
+
+        def on_position(sent, count):
+            metrics.update(sent, count)
+            if on_progress:
+                on_progress(sent, size_hint)
+
+        writer = _StreamWriter(sock, on_position)
+        write_to(writer)
+        writer.flush()
+        summary = {'size': writer.size, 'sha256': writer.digest.hexdigest()}
+        send_frame(sock, FRAME_END, json.dumps(summary).encode())
+        # Body mode stream mencakup waktu embed yang berjalan bersamaan
+        metrics.mark('body')
+        metrics.total = writer.size
+        _read_ack(sock, writer.size)
+        metrics.mark('ack')
+        return True
+
+
+def open_server(host="0.0.0.0", port=PORT, backlog=1):
+    """Membuka socket server; default menerima dari semua alamat pada port 12345."""
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_socket.bind((host, port))
+    server_socket.listen(backlog)
+    return server_socket
+
+
+def _receive_body(conn, f, digest, offset, end, chunk_size, truncate=True, on_position=None,
+                  chunks=None):
+    """Menyalin pasangan DATA + CHECK ke file sampai END.
+
+    Setiap potongan baru dianggap sah setelah SHA-256-nya cocok. Bila gagal
+    di tengah jalan dan `truncate` aktif, file dipotong ke offset terakhir
+    yang sah agar transfer berikutnya bisa melanjutkan. `end` None berarti
+    ukuran belum diketahui (mode stream). `on_position(offset, jumlah)`
+    dipanggil per potongan sah; `chunks` (dict) diisi digest setiap potongan
+    sah menurut indeksnya. Mengembalikan tuple (offset akhir yang sah, isi
+    frame END).
+    """
+    view = memoryview(bytearray(CHUNK_SIZE))
+    verified = offset
+    try:
+        while True:
+            frame_type, size = _recv_frame_header(conn, max(chunk_size, _MAX_CONTROL_FRAME))
+            if frame_type == FRAME_END and size <= _MAX_CONTROL_FRAME:
+                return verified, _recv_exact(conn, size)
+            if frame_type != FRAME_DATA or size > chunk_size:
+                raise TransferError(f"Frame tak terduga: {frame_type}")
+            if end is None:
+                valid = size > 0
+            else:
+                # Potongan harus penuh (kecuali terakhir) agar offset tetap sejajar
+                valid = size == min(chunk_size, end - verified)
+            if not valid:
+                raise TransferError("Ukuran potongan tidak valid.")
+            chunk_digest = hashlib.sha256()
+            remaining = size
+            while remaining:
+                chunk = view[:min(CHUNK_SIZE, remaining)]
+                _recv_into(conn, chunk)
+                f.write(chunk)
+                chunk_digest.update(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                remaining -= len(chunk)
+            expected = _expect(recv_frame(conn, _DIGEST_SIZE), FRAME_CHECK)[1]
+            if chunk_digest.digest() != expected:
+                raise TransferError("Potongan data rusak.")
+            if chunks is not None:
+                chunks[verified // chunk_size] = expected
+            verified += size
+            if on_position:
+                on_position(verified, size)
+    except BaseException:
+        if truncate:
+            f.truncate(verified)
+        raise
+
+
+def _partial_path(temp_dir, metadata, suffix='.partial'):
+    name = f".hideasy_{metadata['sha256'][:32]}{suffix}"
+    return os.path.join(temp_dir or tempfile.gettempdir(), name)
+
+
+_active_partials = {}  # path .partial -> (koneksi pemilik, Event dilepas)
+_range_transfers = {}
+_finished_ranges = {}  # (path .ranges, id transfer) -> waktu selesai, untuk rentang yang dikirim ulang
+_partials_lock = threading.Lock()
+
+
+class _Rejected(TransferError):
+    """Penolakan yang pesannya diteruskan ke sender sebagai ERROR."""
+
+
+class _RangeTransfer:
+    """State bersama semua koneksi yang mengirim rentang dari satu file."""
+
+    def __init__(self, path, metadata):
+        self.path = path
+        self.chunks = -(-metadata['size'] // metadata['chunk_size'])
+        self.digests = {}  # indeks potongan terverifikasi -> SHA-256-nya
+        self.finished = False
+        # Alokasikan penuh di awal agar setiap rentang bisa ditulis di posisinya
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o600)
+        try:
+            os.ftruncate(fd, metadata['size'])
+            if hasattr(os, 'posix_fallocate') and metadata['size']:
+                try:
+                    os.posix_fallocate(fd, 0, metadata['size'])
+                except OSError:
+                    pass  # filesystem tidak mendukung; ftruncate sudah cukup
+        finally:
+            os.close(fd)
+
+
+def _send_resume(conn, offset, metrics, on_receiving, start=0):
+    """Membalas HEADER dengan RESUME; mengembalikan callback progres untuk _receive_body."""
+    send_frame(conn, FRAME_RESUME, json.dumps({'offset': offset}).encode())
+    metrics.mark('handshake')
+    metrics.resumed(offset - start)
+    metrics.update(offset - start)
+    if on_receiving:
+        on_receiving()
+    return lambda position, count: metrics.update(position - start, count)
+
+
+def _finish_file(path, metadata, temp_dir, digest):
+    """Memverifikasi SHA-256 seluruh file lalu memindahkannya ke nama unik.
+
+    File yang tidak cocok dihapus dan TransferError dilempar.
+    """
+    if os.path.getsize(path) != metadata['size'] or digest.hexdigest() != metadata['sha256']:
+        _discard_corrupt(path)
+    return _store_file(path, temp_dir)
+
+
+def _discard_corrupt(path):
+    # Isi lengkap tapi salah: mulai dari awal pada percobaan berikutnya
+    os.remove(path)
+    raise _Rejected("File yang diterima tidak lengkap atau rusak.")
+
+
+def _store_file(path, temp_dir):
+    # Nama unik agar pengiriman ulang file yang sama tidak menimpanya
+    fd, temp_path = tempfile.mkstemp(prefix='.hideasy_', suffix='.part', dir=temp_dir)
+    os.close(fd)
+    os.replace(path, temp_path)
+    return temp_path
+
+
+def _receive_range(conn, metadata, temp_dir, on_receiving, accept, metrics):
+    """Menerima satu rentang dari transfer multi-stream.
+
+    Mengembalikan path file final bila rentang ini melengkapi file, selain
+    itu None.
+    """
+    path = _partial_path(temp_dir, metadata, '.ranges')
+    start, end = metadata['range']
+    chunk_size = metadata['chunk_size']
+    metrics.total = end - start
+    with _partials_lock:
+        now = time.monotonic()
+        for key, finished_at in list(_finished_ranges.items()):
+            if now - finished_at > RECEIVE_TIMEOUT:
+                del _finished_ranges[key]
+        finished = (path, metadata['transfer']) in _finished_ranges
+        state = _range_transfers.get(path)
+        if state is None and not finished:
+            state = _range_transfers[path] = _RangeTransfer(path, metadata)
+
+    if finished:
+        # Rentang dikirim ulang karena ACK-nya tidak sampai, padahal file
+        # sudah lengkap: tidak ada lagi yang perlu diterima
+        _send_resume(conn, end, metrics, on_receiving, start)
+        _receive_body(conn, None, None, end, end, chunk_size, truncate=False)
+        metadata['complete'] = True
+        return None
+
+    on_position = _send_resume(conn, start, metrics, on_receiving, start)
+    with open(path, 'r+b') as f:
+        f.seek(start)
+        _receive_body(conn, f, None, start, end, chunk_size, truncate=False,
+                      on_position=on_position, chunks=state.digests)
+    metrics.mark('body')
+
+    with _partials_lock:
+        if len(state.digests) < state.chunks or state.finished:
+            return None
+        state.finished = True
+        del _range_transfers[path]
+        _finished_ranges[path, metadata['transfer']] = time.monotonic()
+
+    try:
+        refusal = accept(metadata) if accept else None
+        if refusal:
+            os.remove(path)
+            raise _Rejected(refusal)
+        # Setiap potongan sudah dicek SHA-256-nya saat diterima; cukup
+        # rangkaian digest-nya yang dicocokkan, tanpa membaca ulang file
+        digests = b''.join(state.digests[index] for index in range(state.chunks))
+        if hashlib.sha256(digests).hexdigest() != metadata['chunks']:
+            _discard_corrupt(path)
+    except BaseException:
+        with _partials_lock:
+            _finished_ranges.pop((path, metadata['transfer']), None)
+        raise
+    path = _store_file(path, temp_dir)
+    metrics.mark('verify')
+    return path
+
+
+def _resume_offset(f, metadata, digest):
+    """Offset lanjutan dari file setengah jadi; digest diisi dengan isinya."""
+    existing = f.seek(0, os.SEEK_END)
+    offset = 0
+    if existing <= metadata['size']:
+        offset = existing - existing % metadata['chunk_size']
+    f.truncate(offset)
+    f.seek(0)
+    view = memoryview(bytearray(CHUNK_SIZE))
+    remaining = offset
+    while remaining:
+        read = f.readinto(view[:min(CHUNK_SIZE, remaining)])
+        if not read:
+            raise TransferError("File setengah jadi berubah.")
+        digest.update(view[:read])
+        remaining -= read
+    return offset
+
+
+def _receive_partial(conn, partial, metadata, temp_dir, on_receiving, metrics):
+    digest = hashlib.sha256()
+    fd = os.open(partial, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o600)
+    with os.fdopen(fd, 'r+b') as f:
+        offset = _resume_offset(f, metadata, digest)
+        on_position = _send_resume(conn, offset, metrics, on_receiving)
+        _receive_body(conn, f, digest, offset, metadata['size'], metadata['chunk_size'],
+                      on_position=on_position)
+    metrics.mark('body')
+    path = _finish_file(partial, metadata, temp_dir, digest)
+    metrics.mark('verify')
+    return path
+
+
+def _stream_summary(metadata, trailer):
+    """Mengisi ukuran dan SHA-256 dari isi frame END mode stream."""
+    try:
+        summary = json.loads(bytes(trailer).decode('utf-8'))
+        metadata['size'], metadata['sha256'] = int(summary['size']), summary['sha256']
+    except (ValueError, KeyError, TypeError):
+        raise _Rejected("Ringkasan stream rusak.")
+
+
+def _extracted_path(metadata, temp_dir, extractor_run):
+    """Menjalankan ekstraksi ke file sementara `.doc`; metadata diganti milik dokumen.
+
+    Mengembalikan None (dan `.doc` dihapus) bila `extractor_run` mengembalikan
+    None, yaitu file tidak bisa diekstrak dan disimpan apa adanya.
+    """
+    fd, path = tempfile.mkstemp(prefix='.hideasy_', suffix='.doc', dir=temp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            result = extractor_run(out)
+    except BaseException:
+        os.remove(path)
+        raise
+    if result is None:
+        os.remove(path)
+        return None
+    name, size = result
+    metadata.update(name=os.path.basename(name) or metadata['name'], size=size, extracted=True)
+    return path
+
+
+def _close_extractor(extractor, key, out, stego_path=None):
+    """Menutup extractor; bila tidak ada header format 4, `stego_path` diekstrak utuh.
+
+    stego.extract mengenali media LSB dan format 0-3 yang tidak bisa
+    diproses sebagai aliran. Mengembalikan (nama, ukuran), atau None bila
+    file itu juga gagal diekstrak (bukan file stego, kunci salah untuk format
+    lama) sehingga disimpan apa adanya. Kegagalan setelah header format 4
+    ditemukan ditolak dengan ERROR.
+    """
+    try:
+        return extractor.close()
+    except stego.StegoError as e:
+        if stego_path is None or extractor.saw_header:
+            raise _Rejected(str(e))
+    try:
+        name, data = stego.extract(stego_path, key)
+    except stego.StegoError:
+        return None
+    out.write(data)
+    return name, len(data)
+
+
+class _ExtractSpool:
+    """Meneruskan aliran ke StreamExtractor sambil menyalinnya ke file sementara.
+
+    Salinan hanya disimpan sampai header format 4 ditemukan; setelah itu
+    dokumen pasti diekstrak dari aliran dan salinannya dibuang. `path` None
+    berarti tidak ada salinan.
+    """
+
+    def __init__(self, extractor, temp_dir):
+        self.extractor = extractor
+        fd, self.path = tempfile.mkstemp(prefix='.hideasy_', suffix='.stream', dir=temp_dir)
+        self._file = os.fdopen(fd, 'wb')
+
+    def write(self, data):
+        self.extractor.write(data)
+        if self._file is not None:
+            if self.extractor.found:
+                self.discard()
+            else:
+                self._file.write(data)
+        return len(data)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def keep(self, temp_dir):
+        """Menyimpan salinan sebagai file yang diterima; mengembalikan path-nya."""
+        path, self.path = self.path, None
+        return _store_file(path, temp_dir)
+
+    def discard(self):
+        self.close()
+        self._file = None
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+
+
+def _receive_extracted(conn, metadata, temp_dir, on_receiving, accept, key, metrics):
+    """Menerima file utuh/stream sambil mengekstraknya; file stego tidak disimpan.
+
+    Kecuali sampai header format 4 ditemukan: file tanpa header itu disalin
+    sementara untuk stego.extract, lalu disimpan apa adanya (metadata tanpa
+    `extracted`) bila tetap tidak bisa diekstrak. Tidak bisa dilanjutkan:
+    RESUME selalu 0 karena tidak ada yang tersimpan.
+    """
+    refusal = accept(metadata) if accept else None
+    if refusal:
+        raise _Rejected(refusal)
+    spool = None
+
+    def run(out):
+        nonlocal spool
+        spool = _ExtractSpool(stego.StreamExtractor(key, out), temp_dir)
+        digest = hashlib.sha256()
+        on_position = _send_resume(conn, 0, metrics, on_receiving)
+        end = None if metadata.get('stream') else metadata['size']
+        try:
+            received, trailer = _receive_body(conn, spool, digest, 0, end,
+                                              metadata['chunk_size'], truncate=False,
+                                              on_position=on_position)
+        finally:
+            spool.close()
+        # Ekstraksi berjalan bersamaan, jadi body sudah mencakup waktunya
+        metrics.mark('body')
+        if metadata.get('stream'):
+            _stream_summary(metadata, trailer)
+        if received != metadata['size'] or digest.hexdigest() != metadata['sha256']:
+            raise _Rejected("File yang diterima tidak lengkap atau rusak.")
+        result = _close_extractor(spool.extractor, key, out, spool.path)
+        metrics.mark('verify')
+        return result
+
+    try:
+        path = _extracted_path(metadata, temp_dir, run)
+        return path if path is not None else spool.keep(temp_dir)
+    finally:
+        if spool is not None:
+            spool.discard()
+
+
+def _extract_file(path, metadata, temp_dir, key, metrics):
+    """Mengekstrak file stego yang sudah lengkap (multi-stream) lalu menghapusnya.
+
+    File yang tidak bisa diekstrak dikembalikan apa adanya.
+    """
+    def run(out):
+        extractor = stego.StreamExtractor(key, out)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                extractor.write(chunk)
+        return _close_extractor(extractor, key, out, path)
+
+    try:
+        extracted = _extracted_path(metadata, temp_dir, run)
+    except BaseException:
+        os.remove(path)
+        raise
+    finally:
+        metrics.mark('extract')
+    if extracted is None:
+        return path
+    os.remove(path)
+    return extracted
+
+
+def _receive_stream(conn, metadata, temp_dir, on_receiving, accept, metrics):
+    """Menerima data mode stream; ukuran dan SHA-256 datang di frame END."""
+    refusal = accept(metadata) if accept else None
+    if refusal:
+        raise _Rejected(refusal)
+    fd, path = tempfile.mkstemp(prefix='.hideasy_', suffix='.stream', dir=temp_dir)
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, 'wb') as f:
+            on_position = _send_resume(conn, 0, metrics, on_receiving)
+            received, trailer = _receive_body(conn, f, digest, 0, None,
+                                              metadata['chunk_size'], truncate=False,
+                                              on_position=on_position)
+        metrics.mark('body')
+        _stream_summary(metadata, trailer)
+        metrics.total = metadata['size']
+        if received != metadata['size']:
+            raise _Rejected("File yang diterima tidak lengkap atau rusak.")
+        temp_path = _finish_file(path, metadata, temp_dir, digest)
+        metrics.mark('verify')
+        return temp_path
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def sweep_partials(temp_dir=None, max_age=PARTIAL_MAX_AGE):
+    """Menghapus file sementara receiver yang ditinggalkan di `temp_dir`.
+
+    Yang dihapus: `.partial` dan `.ranges` (transfer yang tidak dilanjutkan)
+    serta sisa `.stream`/`.doc` dari proses yang terhenti, bila tidak diubah
+    selama `max_age` detik dan tidak sedang dipakai koneksi. File `.part`
+    yang sudah lengkap tidak disentuh karena milik antrian atau pemanggil.
+    Mengembalikan jumlah file yang dihapus.
+    """
+    folder = temp_dir or tempfile.gettempdir()
+    now = time.time()
+    removed = 0
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.name.startswith('.hideasy_') or \
+                not entry.name.endswith(('.partial', '.ranges', '.stream', '.doc')):
+            continue
+        with _partials_lock:
+            if entry.path in _active_partials:
+                continue
+            try:
+                if now - entry.stat().st_mtime < max_age:
+                    continue
+                os.remove(entry.path)
+            except OSError:
+                continue
+            # State rentang yang ditinggalkan tidak akan pernah lengkap
+            _range_transfers.pop(entry.path, None)
+            removed += 1
+    return removed
+
+
+def _claim_partial(partial, conn):
+    """Menjadikan `conn` pemilik file .partial; mengembalikan Event pelepasannya.
+
+    Koneksi yang putus diam-diam (mis. Wi-Fi hilang) masih memegang partial
+    sampai recv-nya gagal. Sender yang menyambung ulang mengambil alih:
+    koneksi lama diputus, lalu ditunggu sampai melepas partial (dan
+    memotongnya ke posisi terverifikasi) sebelum resume dimulai.
+    """
+    while True:
+        with _partials_lock:
+            owner = _active_partials.get(partial)
+            if owner is None:
+                released = threading.Event()
+                _active_partials[partial] = (conn, released)
+                return released
+        old_conn, old_released = owner
+        try:
+            old_conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        if not old_released.wait(RECEIVE_TIMEOUT):
+            raise _Rejected("Transfer file yang sama sedang berjalan.")
+
+
+def _receive_whole(conn, metadata, temp_dir, on_receiving, accept, metrics):
+    partial = _partial_path(temp_dir, metadata)
+    released = _claim_partial(partial, conn)
+    try:
+        refusal = accept(metadata) if accept else None
+        if refusal:
+            raise _Rejected(refusal)
+        return _receive_partial(conn, partial, metadata, temp_dir, on_receiving, metrics)
+    finally:
+        with _partials_lock:
+            del _active_partials[partial]
+        released.set()
+
+
+def _receive_connection(conn, temp_dir=None, on_receiving=None, accept=None, on_verified=None,
+                        extract_key=None, metrics=None):
+    """Menerima satu file (atau satu rentangnya) ke file sementara.
+
+    `accept(metadata)` boleh mengembalikan pesan penolakan (str); sender
+    lalu dikirimi ERROR. Untuk file utuh dipanggil sebelum isi dibaca, untuk
+    rentang multi-stream saat file sudah lengkap. `on_verified(metadata,
+    path)` dipanggil setelah checksum cocok, sebelum ACK dikirim.
+    Dengan `extract_key`, yang disimpan adalah dokumen hasil ekstraksi dan
+    metadata diganti dengan nama serta ukuran dokumen itu. Durasi fase dan
+    progres dicatat di `metrics` bila diberikan. Mengembalikan (metadata,
+    path); path None bila rentang ini belum melengkapi file.
+    """
+    if metrics is None:
+        metrics = TransferMetrics('receive')
+    metadata = _unpack_header(_expect(recv_frame(conn), FRAME_HEADER)[1])
+    metrics.name, metrics.total = metadata['name'], metadata.get('size')
+    if metadata.get('stream'):
+        receive = _receive_stream
+    elif 'range' in metadata:
+        receive = _receive_range
+    else:
+        receive = _receive_whole
+    try:
+        if extract_key is not None and receive is not _receive_range:
+            temp_path = _receive_extracted(conn, metadata, temp_dir, on_receiving, accept,
+                                           extract_key, metrics)
+        else:
+            temp_path = receive(conn, metadata, temp_dir, on_receiving, accept, metrics)
+            if temp_path and extract_key is not None:
+                temp_path = _extract_file(temp_path, metadata, temp_dir, extract_key, metrics)
+    except _Rejected as e:
+        send_frame(conn, FRAME_ERROR, str(e).encode())
+        raise
+    if temp_path and on_verified:
+        on_verified(metadata, temp_path)
+    complete = temp_path is not None or metadata.get('complete', False)
+    send_frame(conn, FRAME_ACK, json.dumps({'complete': complete}).encode())
+    metrics.mark('ack')
+    return metadata, temp_path
+
+
+def _has_next_frame(conn):
+    """Menunggu frame berikutnya; False bila sender menutup koneksi dengan rapi
+    atau tidak mengirim apa pun selama batas waktu baca."""
+    try:
+        return bool(conn.recv(1, socket.MSG_PEEK))
+    except socket.timeout:
+        return False
+
+
+def receive_file(server_socket, temp_dir=None, on_connect=None, on_receiving=None):
+    """Menerima satu file dari koneksi berikutnya ke file sementara.
+
+    File ditulis di `temp_dir` (default: folder temp sistem). Mengembalikan
+    tuple (nama_file, path_sementara); pemanggil memindahkan file itu ke
+    tujuan akhir. Bila ukuran atau checksum tidak cocok, sender dikirimi
+    ERROR, file sementara dihapus, dan TransferError dilempar. Transfer
+    multi-stream memerlukan ReceiverService karena memakai banyak koneksi.
+    """
+    conn, addr = server_socket.accept()
+    if on_connect:
+        on_connect(addr)
+
+    with conn:
+        conn.settimeout(RECEIVE_TIMEOUT)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        metadata, temp_path = _receive_connection(conn, temp_dir, on_receiving)
+    return metadata['name'], temp_path
+
+
+class ReceiverService:
+    """Server penerima yang melayani banyak sender sekaligus.
+
+    Setiap koneksi ditangani di thread pool dengan state-nya sendiri. File
+    yang lolos verifikasi masuk ke antrian berbatas `max_pending`; selama
+    antrian penuh, sender baru ditolak dengan ERROR sebelum isi file dikirim
+    (untuk multi-stream: saat rentang terakhir selesai). Bila `extract_key`
+    diisi, item di antrian berisi dokumen hasil ekstraksi, atau file aslinya
+    (`extracted` False) bila file itu tidak bisa diekstrak. `transfers()`
+    mengembalikan TransferMetrics koneksi yang sedang berjalan; bila
+    `log_path` diisi, metrik setiap file ditambahkan ke sana (JSON-lines).
+    File setengah jadi di `temp_dir` yang lebih tua dari `partial_max_age`
+    detik dihapus setiap kali service dimulai dan dihentikan.
+    Callback dipanggil dari thread jaringan:
+        on_connect(addr), on_received(ReceivedFile), on_error(addr, exc)
+    """
+
+    def __init__(self, host="0.0.0.0", port=PORT, temp_dir=None, max_connections=4,
+                 max_pending=8, on_connect=None, on_received=None, on_error=None,
+                 extract_key=None, log_path=None, partial_max_age=PARTIAL_MAX_AGE):
+        self.host = host
+        self.port = port
+        self.temp_dir = temp_dir
+        self.max_connections = max_connections
+        self.on_connect = on_connect
+        self.on_received = on_received
+        self.on_error = on_error
+        self.extract_key = extract_key  # bila diisi, file stego langsung diekstrak
+        self.log_path = log_path
+        self.partial_max_age = partial_max_age
+        self.received = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._connections = set()
+        self._metrics = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server_socket = None
+        self._pool = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def active_connections(self):
+        with self._lock:
+            return len(self._connections)
+
+    def transfers(self):
+        """TransferMetrics milik file yang sedang diterima."""
+        with self._lock:
+            return list(self._metrics)
+
+    def start(self):
+        """Membuka port dan mulai menerima koneksi di thread latar."""
+        if self.running:
+            return
+        sweep_partials(self.temp_dir, self.partial_max_age)
+        self._stopping.clear()
+        self._server_socket = open_server(self.host, self.port, backlog=self.max_connections * 2)
+        # Timeout agar loop accept bisa memeriksa permintaan berhenti
+        self._server_socket.settimeout(0.5)
+        self.port = self._server_socket.getsockname()[1]
+        self._pool = ThreadPoolExecutor(max_workers=self.max_connections,
+                                        thread_name_prefix='hideasy-recv')
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """Berhenti menerima, memutus koneksi aktif, dan menunggu worker selesai.
+
+        File yang sudah lengkap tetap di antrian; gunakan `discard_pending`
+        untuk menghapusnya.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self._thread.join(timeout)
+        self._pool.shutdown(wait=True)
+        self._server_socket.close()
+        self._thread = self._pool = self._server_socket = None
+        sweep_partials(self.temp_dir, self.partial_max_age)
+
+    def take(self):
+        """Mengambil file berikutnya dari antrian (atau None bila kosong).
+
+        Pemanggil menjadi pemilik file sementara di `ReceivedFile.path`.
+        """
+        try:
+            item = self.received.get_nowait()
+        except queue.Empty:
+            return None
+        self._slots.release()
+        return item
+
+    def discard_pending(self):
+        """Menghapus semua file di antrian yang belum diambil."""
+        while True:
+            item = self.take()
+            if item is None:
+                return
+            if os.path.exists(item.path):
+                os.remove(item.path)
+
+    def _accept_loop(self):
+        while not self._stopping.is_set():
+            try:
+                conn, addr = self._server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            # Tanpa batas waktu, koneksi yang putus diam-diam menggantung
+            # selamanya di recv
+            conn.settimeout(RECEIVE_TIMEOUT)
+            with self._lock:
+                self._connections.add(conn)
+            self._pool.submit(self._handle, conn, addr)
+
+    def _reserve(self, metadata):
+        if not self._slots.acquire(blocking=False):
+            return "Antrian penerima penuh, coba lagi nanti."
+        return None
+
+    def _handle(self, conn, addr):
+        try:
+            with conn:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if self.on_connect:
+                    self.on_connect(addr)
+                # Satu koneksi bisa membawa banyak file (send_files)
+                while _has_next_frame(conn):
+                    try:
+                        self._receive_one(conn, addr)
+                    except _Rejected as e:
+                        # Frame sudah terbaca utuh; file berikutnya tetap dilayani
+                        self._report(addr, e)
+        except Exception as e:
+            self._report(addr, e)
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+
+    def _receive_one(self, conn, addr):
+        reserved = False
+
+        def accept(metadata):
+            nonlocal reserved
+            refusal = self._reserve(metadata)
+            reserved = refusal is None
+            return refusal
+
+        def on_verified(metadata, temp_path):
+            # Masuk antrian sebelum ACK, jadi sender yang menerima ACK
+            # dijamin file-nya sudah bisa diambil; slot kini milik antrian
+            nonlocal reserved
+            reserved = False
+            item = ReceivedFile(metadata['name'], temp_path, metadata['size'], addr,
+                                metadata.get('extracted', False))
+            self.received.put(item)
+            if self.on_received:
+                self.on_received(item)
+
+        metrics = TransferMetrics('receive', peer=addr)
+        with self._lock:
+            self._metrics.add(metrics)
+        try:
+            _tracked(metrics, lambda: _receive_connection(
+                conn, self.temp_dir, accept=accept, on_verified=on_verified,
+                extract_key=self.extract_key, metrics=metrics))
+        except BaseException:
+            if reserved:
+                self._slots.release()
+            raise
+        finally:
+            with self._lock:
+                self._metrics.discard(metrics)
+            self._log(metrics)
+
+    def _log(self, metrics):
+        if self.log_path:
+            try:
+                metrics.write_log(self.log_path)
+            except OSError:
+                pass  # log tidak boleh menggagalkan transfer
+
+    def _report(self, addr, error):
+        if self.on_error and not self._stopping.is_set():
+            self.on_error(addr, error)